@@ -4,6 +4,7 @@ from dataclasses import dataclass
 from enum import Enum
 from typing import Literal
 import os
+import re
 
 import dspy
 from azure.identity import DefaultAzureCredential
@@ -20,6 +21,12 @@ class IntentType(Enum):
 
 ActionType = Literal["search", "clarify", "answer", "execute"]
 
+# Precompiled splitter for comma-separated entity strings
+_ENTITY_SPLIT = re.compile(r"\s*,\s*")
+
+# Value -> member lookup; unknown values fall back to RESEARCH
+_INTENT_MAP: dict[str, IntentType] = {m.value: m for m in IntentType}
+
 
 @dataclass
 class Intent:
@@ -35,15 +42,16 @@ class Intent:
     @classmethod
     def from_dict(cls, data: dict) -> "Intent":
         """Create Intent from dictionary."""
-        intent_type = data.get("intent_type", "research")
-        if intent_type in ("research", "organize", "control"):
-            type_enum = IntentType(intent_type)
-        else:
-            type_enum = IntentType.RESEARCH
+        intent_type = data.get("intent_type")
+        type_enum = (
+            _INTENT_MAP.get(intent_type, IntentType.RESEARCH)
+            if isinstance(intent_type, str)
+            else IntentType.RESEARCH
+        )
 
         entities = data.get("entities", [])
         if isinstance(entities, str):
-            entities = [e.strip() for e in entities.split(",") if e.strip()]
+            entities = [e for e in _ENTITY_SPLIT.split(entities.strip()) if e]
 
         return cls(
             type=type_enum,
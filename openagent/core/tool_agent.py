@@ -1,6 +1,7 @@
 """Agent with tool execution capabilities."""
 
 import json
+import re
 from dataclasses import dataclass
 from typing import AsyncIterator
 
@@ -10,6 +11,10 @@ from openagent.tools.registry import ToolRegistry
 from openagent.tools.executor import ToolExecutor, ToolCall, ToolResult
 from openagent.tools.builtin import register_builtin_tools
 
+_decoder = json.JSONDecoder()
+# Opening braces that can start a JSON object (``{`` followed by a key)
+_CANDIDATE_RE = re.compile(r'\{\s*"')
+
 
 @dataclass
 class ToolAgentConfig(AgentConfig):
@@ -42,6 +47,7 @@ class ToolAgent(Agent):
         # Set up tool registry
         self.registry = registry or ToolRegistry()
         self.executor = ToolExecutor(self.registry, max_iterations=self.tool_config.max_tool_iterations)
+        self._cached_prompt: tuple[int, str] | None = None
 
         # Register built-in tools based on config
         categories = []
@@ -57,6 +63,16 @@ class ToolAgent(Agent):
 
     def _get_tool_prompt(self) -> str:
         """Generate tool usage instructions for the system prompt."""
+        version = self.registry.version
+        if self._cached_prompt and self._cached_prompt[0] == version:
+            return self._cached_prompt[1]
+
+        prompt = self._build_tool_prompt()
+        self._cached_prompt = (version, prompt)
+        return prompt
+
+    def _build_tool_prompt(self) -> str:
+        """Render the tool prompt from the current registry contents."""
         tools = self.registry.list_all()
         if not tools:
             return ""
@@ -86,19 +102,11 @@ After receiving tool results, provide a natural language response.
 
     def _parse_tool_call(self, response: str) -> ToolCall | None:
         """Try to parse a tool call from the response."""
-        try:
-            # Try to find JSON in the response
-            response = response.strip()
-
-            # Look for JSON object
-            start = response.find("{")
-            end = response.rfind("}") + 1
-
-            if start == -1 or end == 0:
-                return None
-
-            json_str = response[start:end]
-            data = json.loads(json_str)
+        for match in _CANDIDATE_RE.finditer(response):
+            try:
+                data, _ = _decoder.raw_decode(response, match.start())
+            except json.JSONDecodeError:
+                continue
 
             if "tool" in data:
                 return ToolCall(
@@ -106,8 +114,6 @@ After receiving tool results, provide a natural language response.
                     params=data.get("args", {}),
                     reasoning=data.get("reasoning", ""),
                 )
-        except (json.JSONDecodeError, KeyError):
-            pass
 
         return None
 
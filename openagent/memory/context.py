@@ -8,14 +8,46 @@ Handles:
 - Summarization of older context
 """
 
+from collections import OrderedDict
 from dataclasses import dataclass, field
+from datetime import datetime
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
+    import numpy as np
+
     from openagent.memory.conversation import Message, ConversationHistory
 
+# Token estimate heuristic: ~4 characters per token
+CHARS_PER_TOKEN = 4
+
+
+def _tokens_for_length(length: "int | np.ndarray") -> "int | np.ndarray":
+    """Estimated tokens for a text length (or an array of lengths)."""
+    return length // CHARS_PER_TOKEN + 1
+
+
+def _fit_newest(
+    contents: list[str], tokens: "np.ndarray", budget: int
+) -> tuple[int, int]:
+    """
+    Fit the longest run of newest messages into a token budget.
+
+    Returns (number of messages kept, tokens they use).
+    """
+    import numpy as np  # Only needed for trimming; keeps import time low
 
-@dataclass
+    # Fall back to the length heuristic for messages without a count
+    if len(tokens):
+        lengths = np.fromiter(map(len, contents), dtype=np.int32, count=len(contents))
+        tokens = np.where(tokens > 0, tokens, _tokens_for_length(lengths))
+
+    cumulative = np.cumsum(tokens[::-1], dtype=np.int64)
+    count = int(np.searchsorted(cumulative, budget, side="right"))
+    return count, int(cumulative[count - 1]) if count else 0
+
+
+@dataclass(slots=True)
 class ContextConfig:
     """Configuration for context management."""
 
@@ -30,18 +62,25 @@ class ContextConfig:
     # Summarization
     summarize_after: int = 100  # Summarize after N messages
     summary_max_tokens: int = 2000
+    # Token-based trigger (opt-in): summarize when the weighted token count
+    # over a sliding window exceeds this. Falls back to summarize_after if None.
+    summarize_after_tokens: int | None = None
+    summarize_window_seconds: float = 30.0
 
     # RAG - more context for better retrieval
     max_rag_tokens: int = 8000
     max_rag_chunks: int = 15
 
+    # Built windows cached per (session, history state, prompt, RAG context)
+    window_cache_size: int = 32
+
     @property
     def available_for_context(self) -> int:
         """Tokens available for context (excluding response reserve)."""
         return self.max_tokens - self.reserved_for_response
 
 
-@dataclass
+@dataclass(slots=True)
 class ContextWindow:
     """A prepared context window for LLM consumption."""
 
@@ -63,6 +102,8 @@ class ContextManager:
     def __init__(self, config: ContextConfig | None = None):
         self.config = config or ContextConfig()
         self._summary_cache: dict[str, str] = {}  # session_id -> summary
+        # LRU of built windows, minus the trailing user message
+        self._window_cache: OrderedDict[tuple, ContextWindow] = OrderedDict()
 
     def build(
         self,
@@ -90,6 +131,57 @@ class ContextManager:
         Returns:
             ContextWindow ready for LLM consumption
         """
+        user_tokens = self._estimate_tokens(user_message)
+        config = self.config
+        key = (
+            history.session.id,  # first, for _invalidate_windows
+            # Read from the database each time, so writes made through other
+            # history objects (or cascade deletes) change the key
+            history.last_message_id,
+            history.count(),
+            system_prompt,
+            rag_context,
+            user_tokens,
+            # ContextConfig is mutable; key on the fields the prefix depends on
+            config.available_for_context,
+            config.recent_messages,
+            config.summarize_after,
+            config.max_rag_tokens,
+        )
+
+        prefix = self._window_cache.get(key)
+        if prefix is None:
+            prefix = self._build_prefix(
+                history, user_tokens, system_prompt, rag_context
+            )
+            self._window_cache[key] = prefix
+            if len(self._window_cache) > self.config.window_cache_size:
+                self._window_cache.popitem(last=False)
+        else:
+            self._window_cache.move_to_end(key)
+
+        # 5. Current user message. Copy the cached message dicts so callers
+        # can't modify the cached prefix
+        return ContextWindow(
+            messages=[
+                *(dict(m) for m in prefix.messages),
+                {"role": "user", "content": user_message},
+            ],
+            total_tokens=prefix.total_tokens + user_tokens,
+            included_message_count=prefix.included_message_count + 1,
+            truncated=prefix.truncated,
+            has_summary=prefix.has_summary,
+            rag_chunks_used=prefix.rag_chunks_used,
+        )
+
+    def _build_prefix(
+        self,
+        history: "ConversationHistory",
+        user_tokens: int,
+        system_prompt: str | None,
+        rag_context: str | None,
+    ) -> ContextWindow:
+        """Build everything in the context window before the user message."""
         messages: list[dict] = []
         total_tokens = 0
         budget = self.config.available_for_context
@@ -115,8 +207,7 @@ class ContextManager:
 
         # 3. Check if we need a summary
         has_summary = False
-        all_messages = history.get_all()
-        if len(all_messages) > self.config.summarize_after:
+        if history.count() > self.config.summarize_after:
             summary = self._get_or_create_summary(history)
             if summary:
                 summary_tokens = self._estimate_tokens(summary)
@@ -129,33 +220,25 @@ class ContextManager:
                     has_summary = True
 
         # 4. Recent messages (fill remaining budget)
-        recent = history.get_recent(limit=self.config.recent_messages)
-        included_count = 0
-        truncated = False
+        roles, contents, tokens = history.get_recent_soa(
+            limit=self.config.recent_messages
+        )
 
         # Reserve space for user message
-        user_tokens = self._estimate_tokens(user_message)
         remaining_budget = budget - total_tokens - user_tokens
 
-        # Add messages from oldest to newest (of the recent set)
-        messages_to_add = []
-        for msg in recent:
-            msg_tokens = msg.token_count or self._estimate_tokens(msg.content)
-            if remaining_budget >= msg_tokens:
-                messages_to_add.append({"role": msg.role, "content": msg.content})
-                remaining_budget -= msg_tokens
-                total_tokens += msg_tokens
-                included_count += 1
-            else:
-                truncated = True
-                break
-
-        messages.extend(messages_to_add)
-
-        # 5. Current user message
-        messages.append({"role": "user", "content": user_message})
-        total_tokens += user_tokens
-        included_count += 1
+        included_count, recent_tokens = _fit_newest(
+            contents, tokens, remaining_budget
+        )
+        start = len(roles) - included_count
+        truncated = start > 0
+
+        if included_count:
+            total_tokens += recent_tokens
+            messages.extend(
+                {"role": roles[i], "content": contents[i]}
+                for i in range(start, len(roles))
+            )
 
         return ContextWindow(
             messages=messages,
@@ -203,11 +286,47 @@ class ContextManager:
 
     def should_summarize(self, history: "ConversationHistory") -> bool:
         """Check if history should be summarized."""
-        return history.count() > self.config.summarize_after
+        if self.config.summarize_after_tokens is None:
+            return history.count() > self.config.summarize_after
+        window_tokens = self._window_tokens(history.get_all(), datetime.now())
+        return window_tokens > self.config.summarize_after_tokens
+
+    def _window_tokens(self, messages: list["Message"], now: datetime) -> float:
+        """
+        Estimate recent token volume with a weighted sliding window.
+
+        Messages are bucketed into fixed windows of summarize_window_seconds.
+        The estimate is current + weight * previous, where weight is the part
+        of the previous window still covered by a window ending at `now`.
+        """
+        window = self.config.summarize_window_seconds
+        now_ts = now.timestamp()
+        current_start = now_ts - now_ts % window
+        previous_start = current_start - window
+
+        current = previous = 0
+        for msg in reversed(messages):
+            ts = msg.created_at.timestamp()
+            if ts < previous_start:
+                break
+            tokens = msg.token_count or self._estimate_tokens(msg.content)
+            if ts >= current_start:
+                current += tokens
+            else:
+                previous += tokens
+
+        weight = 1 - (now_ts - current_start) / window
+        return current + weight * previous
 
     def invalidate_summary(self, session_id: str) -> None:
         """Invalidate cached summary for a session."""
         self._summary_cache.pop(session_id, None)
+        self._invalidate_windows(session_id)
+
+    def _invalidate_windows(self, session_id: str) -> None:
+        """Drop cached context windows for a session."""
+        for key in [k for k in self._window_cache if k[0] == session_id]:
+            del self._window_cache[key]
 
     def _get_or_create_summary(self, history: "ConversationHistory") -> str | None:
         """Get cached summary or create placeholder."""
@@ -223,6 +342,7 @@ class ContextManager:
     def set_summary(self, session_id: str, summary: str) -> None:
         """Set summary for a session (called after async summarization)."""
         self._summary_cache[session_id] = summary
+        self._invalidate_windows(session_id)
 
     def _estimate_tokens(self, text: str) -> int:
         """
@@ -231,10 +351,10 @@ class ContextManager:
         Uses simple heuristic: ~4 characters per token.
         For production, use tiktoken or model-specific tokenizer.
         """
-        return len(text) // 4 + 1
+        return int(_tokens_for_length(len(text)))
 
 
-@dataclass
+@dataclass(slots=True)
 class SummarizationRequest:
     """Request to summarize messages (for async processing)."""
 
@@ -242,13 +362,19 @@ class SummarizationRequest:
     messages: list[dict]
     max_tokens: int = 500
 
+    _LINE_TEMPLATE = "%s: %s"
+    _PROMPT_TEMPLATE = (
+        "Summarize this conversation concisely, preserving key information:\n"
+        "\n"
+        "%s\n"
+        "\n"
+        "Summary (max %d tokens):"
+    )
+
     def to_prompt(self) -> str:
         """Generate summarization prompt."""
+        line = self._LINE_TEMPLATE
         conversation = "\n".join(
-            f"{m['role']}: {m['content']}" for m in self.messages
+            [line % (m["role"], m["content"]) for m in self.messages]
         )
-        return f"""Summarize this conversation concisely, preserving key information:
-
-{conversation}
-
-Summary (max {self.max_tokens} tokens):"""
+        return self._PROMPT_TEMPLATE % (conversation, self.max_tokens)
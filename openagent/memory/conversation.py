@@ -4,27 +4,76 @@ from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import Literal
+from typing import TYPE_CHECKING, Any, Literal
 import json
 import sqlite3
 
-from openagent.memory.session import Session
+if TYPE_CHECKING:
+    import numpy as np
+
+from openagent.memory.session import Session, is_sqlite_uri
 
 
 Role = Literal["user", "assistant", "system", "tool"]
 
 
-@dataclass
+@dataclass(slots=True, init=False)
 class Message:
-    """A message in a conversation."""
+    """A message in a conversation.
+
+    Metadata loaded from the database is kept as its raw JSON string and
+    only decoded the first time ``metadata`` is accessed.
+    """
 
     id: int
     session_id: str
     role: Role
     content: str
-    token_count: int = 0
-    created_at: datetime = field(default_factory=datetime.now)
-    metadata: dict = field(default_factory=dict)
+    token_count: int
+    created_at: datetime
+    metadata: dict
+    _metadata_raw: str | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    def __init__(
+        self,
+        id: int,
+        session_id: str,
+        role: Role,
+        content: str,
+        token_count: int = 0,
+        created_at: datetime | None = None,
+        metadata: dict | None = None,
+        # Keyword-only: positional calls keep the generated dataclass order,
+        # and only from_row()/from_rows() pass undecoded JSON
+        *,
+        metadata_raw: str | None = None,
+    ):
+        self.id = id
+        self.session_id = session_id
+        self.role = role
+        self.content = content
+        self.token_count = token_count
+        self.created_at = created_at if created_at is not None else datetime.now()
+        self._metadata_raw = None
+        if metadata is not None:
+            self.metadata = metadata
+        elif metadata_raw:
+            # Leave the metadata slot unset; __getattr__ decodes on first read.
+            self._metadata_raw = metadata_raw
+        else:
+            self.metadata = {}
+
+    def __getattr__(self, name: str) -> Any:
+        # Only reached when a slot is unset, i.e. metadata not yet decoded.
+        if name != "metadata" or self._metadata_raw is None:
+            raise AttributeError(
+                f"{type(self).__name__!r} object has no attribute {name!r}"
+            )
+        self.metadata = json.loads(self._metadata_raw)
+        self._metadata_raw = None
+        return self.metadata
 
     def to_dict(self) -> dict:
         """Convert to LLM-compatible format."""
@@ -40,9 +89,26 @@ class Message:
             content=row[3],
             token_count=row[4],
             created_at=datetime.fromisoformat(row[5]),
-            metadata=json.loads(row[6]) if row[6] else {},
+            metadata_raw=row[6],
         )
 
+    @classmethod
+    def from_rows(cls, rows: list) -> list["Message"]:
+        """Create Messages from a batch of database rows."""
+        _dt = datetime.fromisoformat
+        return [
+            cls(
+                id=row[0],
+                session_id=row[1],
+                role=row[2],
+                content=row[3],
+                token_count=row[4],
+                created_at=_dt(row[5]),
+                metadata_raw=row[6],
+            )
+            for row in rows
+        ]
+
 
 class ConversationHistory(ABC):
     """Abstract base class for conversation history storage."""
@@ -71,6 +137,24 @@ class ConversationHistory(ABC):
         """Get most recent messages."""
         ...
 
+    def get_recent_soa(
+        self, limit: int = 20
+    ) -> tuple[list[str], list[str], "np.ndarray"]:
+        """
+        Get most recent messages as parallel arrays.
+
+        Returns (roles, contents, token_counts) in chronological order, with
+        token counts as an int32 array for vectorised budgeting.
+        """
+        import numpy as np
+
+        recent = self.get_recent(limit)
+        return (
+            [m.role for m in recent],
+            [m.content for m in recent],
+            np.array([m.token_count for m in recent], dtype=np.int32),
+        )
+
     @abstractmethod
     def count(self) -> int:
         """Get total message count in session."""
@@ -86,28 +170,42 @@ class ConversationHistory(ABC):
         """Get total tokens used in this session."""
         ...
 
+    def stats(self) -> tuple[int, int]:
+        """Get (message count, total tokens) for this session."""
+        return self.count(), self.get_total_tokens()
+
+    @property
+    def last_message_id(self) -> int | None:
+        """ID of the most recent message, or None if empty."""
+        recent = self.get_recent(limit=1)
+        return recent[-1].id if recent else None
+
     def get_by_token_budget(self, max_tokens: int) -> list[Message]:
         """
         Get messages that fit within token budget.
 
-        Prioritizes most recent messages.
+        Prioritizes most recent messages. System messages are always
+        included; the rest of the budget goes to the longest run of
+        recent messages that fits.
         Base implementation using get_all(), can be overridden.
         """
         messages = self.get_all()
-        result = []
-        total_tokens = 0
+        budget = max_tokens - sum(
+            m.token_count for m in messages if m.role == "system"
+        )
 
-        # Start from most recent
-        for message in reversed(messages):
-            if total_tokens + message.token_count <= max_tokens:
-                result.insert(0, message)
-                total_tokens += message.token_count
-            elif message.role == "system":
-                # Always include system messages
-                result.insert(0, message)
-                total_tokens += message.token_count
+        # Walk back from the most recent message until the budget runs out
+        start = len(messages)
+        while start > 0:
+            message = messages[start - 1]
+            if message.role != "system":
+                budget -= message.token_count
+                if budget < 0:
+                    break
+            start -= 1
 
-        return result
+        # Always include system messages from before the cut
+        return [m for m in messages[:start] if m.role == "system"] + messages[start:]
 
     def to_llm_format(self, messages: list[Message] | None = None) -> list[dict]:
         """Convert messages to LLM API format."""
@@ -119,14 +217,39 @@ class ConversationHistory(ABC):
 class SQLiteConversationHistory(ConversationHistory):
     """SQLite implementation of conversation history."""
 
+    _SELECT_ALL = """
+        SELECT id, session_id, role, content, token_count, created_at, metadata
+        FROM messages
+        WHERE session_id = ?
+        ORDER BY id ASC
+    """
+
+    _SELECT_RECENT = """
+        SELECT id, session_id, role, content, token_count, created_at, metadata
+        FROM messages
+        WHERE session_id = ?
+        ORDER BY id DESC
+        LIMIT ?
+    """
+
+    _SELECT_RECENT_SOA = """
+        SELECT role, content, token_count
+        FROM messages
+        WHERE session_id = ?
+        ORDER BY id DESC
+        LIMIT ?
+    """
+
     def __init__(self, session: Session, db_path: Path | str):
         super().__init__(session)
         self.db_path = Path(db_path)
+        self._uri = is_sqlite_uri(db_path)
 
     def _get_conn(self) -> sqlite3.Connection:
         """Get a database connection."""
-        conn = sqlite3.connect(self.db_path)
+        conn = sqlite3.connect(self.db_path, uri=self._uri)
         conn.execute("PRAGMA foreign_keys = ON")
+        conn.row_factory = sqlite3.Row
         return conn
 
     def add(
@@ -170,40 +293,39 @@ class SQLiteConversationHistory(ConversationHistory):
     def get_all(self) -> list[Message]:
         """Get all messages in session, ordered by creation time."""
         with self._get_conn() as conn:
-            cursor = conn.execute(
-                """
-                SELECT * FROM messages
-                WHERE session_id = ?
-                ORDER BY created_at ASC
-                """,
-                (self.session.id,),
-            )
-            return [Message.from_row(row) for row in cursor.fetchall()]
+            rows = conn.execute(self._SELECT_ALL, (self.session.id,)).fetchall()
+        return Message.from_rows(rows)
 
     def get_recent(self, limit: int = 20) -> list[Message]:
         """Get most recent messages."""
         with self._get_conn() as conn:
-            cursor = conn.execute(
-                """
-                SELECT * FROM messages
-                WHERE session_id = ?
-                ORDER BY created_at DESC
-                LIMIT ?
-                """,
-                (self.session.id, limit),
-            )
-            # Reverse to get chronological order
-            rows = cursor.fetchall()
-            return [Message.from_row(row) for row in reversed(rows)]
+            rows = conn.execute(
+                self._SELECT_RECENT, (self.session.id, limit)
+            ).fetchall()
+        # Reverse to get chronological order
+        rows.reverse()
+        return Message.from_rows(rows)
+
+    def get_recent_soa(
+        self, limit: int = 20
+    ) -> tuple[list[str], list[str], "np.ndarray"]:
+        """Get most recent messages as parallel arrays, skipping Message objects."""
+        import numpy as np
+
+        with self._get_conn() as conn:
+            conn.row_factory = None
+            rows = conn.execute(
+                self._SELECT_RECENT_SOA, (self.session.id, limit)
+            ).fetchall()
+        rows.reverse()
+        if not rows:
+            return [], [], np.zeros(0, dtype=np.int32)
+        roles, contents, tokens = zip(*rows)
+        return list(roles), list(contents), np.array(tokens, dtype=np.int32)
 
     def count(self) -> int:
         """Get total message count in session."""
-        with self._get_conn() as conn:
-            cursor = conn.execute(
-                "SELECT COUNT(*) FROM messages WHERE session_id = ?",
-                (self.session.id,),
-            )
-            return cursor.fetchone()[0]
+        return self._query_stats()[0]
 
     def clear(self, keep_system: bool = True) -> int:
         """
@@ -231,10 +353,34 @@ class SQLiteConversationHistory(ConversationHistory):
 
     def get_total_tokens(self) -> int:
         """Get total tokens used in this session."""
+        return self._query_stats()[1]
+
+    def stats(self) -> tuple[int, int]:
+        """Get (message count, total tokens) for this session."""
+        count, total_tokens, _ = self._query_stats()
+        return count, total_tokens
+
+    @property
+    def last_message_id(self) -> int | None:
+        """ID of the most recent message, or None if empty."""
+        return self._query_stats()[2]
+
+    def _query_stats(self) -> tuple[int, int, int | None]:
+        """
+        Read message count, token total and last message ID in one query.
+
+        Always read from the database (an aggregate over the session_id
+        index), so writes from other history objects or cascade deletes
+        are never missed.
+        """
         with self._get_conn() as conn:
             cursor = conn.execute(
-                "SELECT SUM(token_count) FROM messages WHERE session_id = ?",
+                """
+                SELECT COUNT(*), COALESCE(SUM(token_count), 0), MAX(id)
+                FROM messages
+                WHERE session_id = ?
+                """,
                 (self.session.id,),
             )
-            result = cursor.fetchone()[0]
-            return result or 0
+            count, total_tokens, last_message_id = cursor.fetchone()
+            return count, total_tokens, last_message_id
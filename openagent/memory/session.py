@@ -3,10 +3,26 @@
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
+from typing import Any, Callable
 import json
+import os
 import sqlite3
 import uuid
 
+_json_loads: Callable[[str | bytes], Any]
+
+try:
+    import orjson
+except ImportError:  # optional: pip install openagent[fast]
+    _json_loads = json.loads
+else:
+    _json_loads = orjson.loads
+
+
+def is_sqlite_uri(db_path: Path | str) -> bool:
+    """Check if a database path is a SQLite URI (e.g. a shared in-memory DB)."""
+    return str(db_path).startswith("file:")
+
 
 @dataclass
 class Session:
@@ -24,7 +40,7 @@ class Session:
         return {
             "id": self.id,
             "name": self.name,
-            "codebase_path": str(self.codebase_path) if self.codebase_path else None,
+            "codebase_path": os.fspath(self.codebase_path) if self.codebase_path else None,
             "created_at": self.created_at.isoformat(),
             "last_accessed": self.last_accessed.isoformat(),
             "metadata": self.metadata,
@@ -39,7 +55,7 @@ class Session:
             codebase_path=Path(row[2]) if row[2] else None,
             created_at=datetime.fromisoformat(row[3]),
             last_accessed=datetime.fromisoformat(row[4]),
-            metadata=json.loads(row[5]) if row[5] else {},
+            metadata=_json_loads(row[5]) if row[5] else {},
         )
 
 
@@ -83,38 +99,49 @@ class SessionManager:
     CREATE INDEX IF NOT EXISTS idx_token_usage_session ON token_usage(session_id);
     """
 
-    def __init__(self, db_path: Path | str):
+    def __init__(self, db_path: Path | str, init_schema: bool = True):
         self.db_path = Path(db_path)
-        self.db_path.parent.mkdir(parents=True, exist_ok=True)
-        self._init_db()
+        self._uri = is_sqlite_uri(db_path)
+        if not self._uri:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        if init_schema:
+            self._init_db()
+
+    @classmethod
+    def init_schema(cls, conn: sqlite3.Connection) -> None:
+        """Create the schema on an open connection (idempotent)."""
+        conn.executescript(cls.SCHEMA)
+        conn.commit()
 
     def _init_db(self) -> None:
         """Initialize database schema."""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.executescript(self.SCHEMA)
-            conn.commit()
+        with sqlite3.connect(self.db_path, uri=self._uri) as conn:
+            self.init_schema(conn)
 
     def _get_conn(self) -> sqlite3.Connection:
         """Get a database connection."""
-        conn = sqlite3.connect(self.db_path)
+        conn = sqlite3.connect(self.db_path, uri=self._uri)
         conn.execute("PRAGMA foreign_keys = ON")
         return conn
 
-    def create(
-        self,
-        name: str | None = None,
-        codebase_path: Path | str | None = None,
-        metadata: dict | None = None,
-    ) -> Session:
-        """Create a new session."""
-        session_id = str(uuid.uuid4())[:8]
-        now = datetime.now()
+    _INSERT = """
+    INSERT INTO sessions (id, name, codebase_path, created_at, last_accessed, metadata)
+    VALUES (?, ?, ?, ?, ?, ?)
+    """
 
+    @staticmethod
+    def _new_session(
+        name: str | None,
+        codebase_path: Path | str | None,
+        metadata: dict | None,
+        now: datetime,
+    ) -> Session:
+        """Build an unsaved Session with a fresh ID."""
         if name is None:
             name = f"Session {now.strftime('%Y-%m-%d %H:%M')}"
 
-        session = Session(
-            id=session_id,
+        return Session(
+            id=str(uuid.uuid4())[:8],
             name=name,
             codebase_path=Path(codebase_path) if codebase_path else None,
             created_at=now,
@@ -122,25 +149,48 @@ class SessionManager:
             metadata=metadata or {},
         )
 
+    @staticmethod
+    def _insert_params(session: Session) -> tuple:
+        """Row values for inserting a session."""
+        return (
+            session.id,
+            session.name,
+            os.fspath(session.codebase_path) if session.codebase_path else None,
+            session.created_at.isoformat(),
+            session.last_accessed.isoformat(),
+            json.dumps(session.metadata),
+        )
+
+    def create(
+        self,
+        name: str | None = None,
+        codebase_path: Path | str | None = None,
+        metadata: dict | None = None,
+    ) -> Session:
+        """Create a new session."""
+        session = self._new_session(name, codebase_path, metadata, datetime.now())
+
         with self._get_conn() as conn:
-            conn.execute(
-                """
-                INSERT INTO sessions (id, name, codebase_path, created_at, last_accessed, metadata)
-                VALUES (?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    session.id,
-                    session.name,
-                    str(session.codebase_path) if session.codebase_path else None,
-                    session.created_at.isoformat(),
-                    session.last_accessed.isoformat(),
-                    json.dumps(session.metadata),
-                ),
-            )
+            conn.execute(self._INSERT, self._insert_params(session))
             conn.commit()
 
         return session
 
+    def create_many(self, names: list[str]) -> list[Session]:
+        """Create several sessions in a single transaction."""
+        # Stamp each session separately so creation order survives sorting
+        sessions = [
+            self._new_session(name, None, None, datetime.now()) for name in names
+        ]
+
+        with self._get_conn() as conn:
+            conn.executemany(
+                self._INSERT, [self._insert_params(s) for s in sessions]
+            )
+            conn.commit()
+
+        return sessions
+
     def load(self, session_id: str) -> Session | None:
         """Load an existing session by ID."""
         with self._get_conn() as conn:
@@ -165,22 +215,19 @@ class SessionManager:
             session.last_accessed = new_accessed
             return session
 
-    def list_all(self) -> list[Session]:
-        """List all sessions, ordered by last accessed."""
+    def list_all(self, limit: int | None = None) -> list[Session]:
+        """List sessions, ordered by last accessed (all if limit is None)."""
         with self._get_conn() as conn:
+            # SQLite treats a negative LIMIT as "no limit"
             cursor = conn.execute(
-                "SELECT * FROM sessions ORDER BY last_accessed DESC"
+                "SELECT * FROM sessions ORDER BY last_accessed DESC LIMIT ?",
+                (-1 if limit is None else limit,),
             )
             return [Session.from_row(row) for row in cursor.fetchall()]
 
     def get_recent(self, limit: int = 10) -> list[Session]:
         """Get most recently accessed sessions."""
-        with self._get_conn() as conn:
-            cursor = conn.execute(
-                "SELECT * FROM sessions ORDER BY last_accessed DESC LIMIT ?",
-                (limit,),
-            )
-            return [Session.from_row(row) for row in cursor.fetchall()]
+        return self.list_all(limit)
 
     def delete(self, session_id: str) -> bool:
         """Delete a session and all associated data."""
@@ -202,7 +249,7 @@ class SessionManager:
                 """,
                 (
                     session.name,
-                    str(session.codebase_path) if session.codebase_path else None,
+                    os.fspath(session.codebase_path) if session.codebase_path else None,
                     datetime.now().isoformat(),
                     json.dumps(session.metadata),
                     session.id,
@@ -1,6 +1,8 @@
 """JSON-RPC method handlers."""
 
+import functools
 import hashlib
+import logging
 from pathlib import Path
 from typing import Any, Callable, Awaitable
 
@@ -11,6 +13,8 @@ from openagent.rag.store import RAGStore, Chunk, ChunkMetadata
 from openagent.rag.query import RAGQuery
 from openagent.rag.scanner import scan_and_generate_chunks
 
+logger = logging.getLogger(__name__)
+
 # Type for async notification sender
 NotifySender = Callable[[str, dict], Awaitable[None]]
 
@@ -395,17 +399,19 @@ class Handlers:
             collection = self.rag_store._collection
             result = collection.get(include=["embeddings", "metadatas"])
 
-            if not result["ids"] or not result["embeddings"]:
+            # Chroma may return embeddings as a list of lists or an ndarray
+            embeddings = result["embeddings"]
+            if not result["ids"] or embeddings is None or len(embeddings) == 0:
                 return {"points": [], "count": 0}
 
             ids = result["ids"]
-            embeddings = result["embeddings"]
             metadatas = result["metadatas"] or [{}] * len(ids)
 
             # Project to 2D using PCA
             import numpy as np
 
-            embeddings_array = np.array(embeddings)
+            # float32 halves memory traffic and is Chroma's native precision
+            embeddings_array = np.asarray(embeddings, dtype=np.float32)
 
             if len(embeddings_array) < 2:
                 # Not enough points for PCA, just use first 2 dims
@@ -529,23 +535,28 @@ def create_handlers(
     rag_db_path: Path | str | None = None,
     notify: NotifySender | None = None,
 ) -> dict:
-    """Create handler functions dictionary for JSON-RPC server."""
+    """Create handler functions dictionary for JSON-RPC server.
+
+    Every call builds a fresh Handlers instance, so no session or agent
+    state is shared between callers. The session database and RAG store
+    for a given pair of paths are opened once and reused.
+    """
     if db_path is None:
         db_path = Path.home() / ".local/share/openagent/sessions.db"
 
     if rag_db_path is None:
         rag_db_path = Path.home() / ".local/share/openagent/chroma_db"
 
-    session_manager = SessionManager(db_path)
+    session_manager = _open_session_manager(str(db_path))
 
     # Initialize RAG components (default collection, will be switched per-codebase)
+    rag_store: RAGStore | None
+    rag_query: RAGQuery | None
     try:
-        rag_store = RAGStore(db_path=rag_db_path)
-        rag_query = RAGQuery(store=rag_store)
+        rag_store, rag_query = _open_rag(str(rag_db_path))
     except Exception as e:
-        print(f"Warning: Could not initialize RAG: {e}")
-        rag_store = None
-        rag_query = None
+        logger.warning("Could not initialize RAG: %s", e)
+        rag_store, rag_query = None, None
 
     handlers = Handlers(
         session_manager=session_manager,
@@ -575,3 +586,23 @@ def create_handlers(
         "rag.embeddings": handlers.rag_embeddings,
         "codebase.init": handlers.codebase_init,
     }
+
+
+# The opened stores hold no per-request state (Handlers swaps in a new RAG
+# store when the codebase changes), so they are shared between handler sets.
+@functools.lru_cache(maxsize=8)
+def _open_session_manager(db_path: str) -> SessionManager:
+    """Open the session database at db_path."""
+    return SessionManager(db_path)
+
+
+@functools.lru_cache(maxsize=8)
+def _open_rag(rag_db_path: str) -> tuple[RAGStore, RAGQuery]:
+    """
+    Open the default RAG collection at rag_db_path.
+
+    Raises if the store can't be opened. lru_cache doesn't cache exceptions,
+    so a failed open is retried by the next create_handlers() call.
+    """
+    rag_store = RAGStore(db_path=rag_db_path)
+    return rag_store, RAGQuery(store=rag_store)
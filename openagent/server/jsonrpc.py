@@ -1,13 +1,19 @@
 """JSON-RPC 2.0 server over stdio."""
 
 import asyncio
+import inspect
 import json
 import sys
 from dataclasses import dataclass, field
 from typing import Any, Callable, Awaitable, Literal
 
 
-Handler = Callable[[dict], Awaitable[Any]]
+# Handlers may be coroutine functions or plain functions; a handler's result is
+# only awaited when it is awaitable.
+Handler = Callable[[dict], Awaitable[Any] | Any]
+
+# Compact JSON encoding for everything written to the client
+_SEPARATORS = (",", ":")
 
 
 @dataclass
@@ -73,11 +79,14 @@ class JSONRPCServer:
 
     def register(self, method: str, handler: Handler) -> None:
         """Register a method handler."""
+        # Interned keys let dispatch lookups match by identity
+        method = sys.intern(method)
         self._handlers[method] = handler
 
     def register_all(self, handlers: dict[str, Handler]) -> None:
         """Register multiple handlers at once."""
-        self._handlers.update(handlers)
+        for method, handler in handlers.items():
+            self.register(method, handler)
 
     async def run(self) -> None:
         """Main server loop - read from stdin, write to stdout."""
@@ -117,15 +126,22 @@ class JSONRPCServer:
     async def _handle(self, data: dict) -> dict | None:
         """Handle a single request."""
         request = Request.from_dict(data)
+        method = request.method
+        if isinstance(method, str):
+            method = sys.intern(method)
 
-        handler = self._handlers.get(request.method)
+        handler = self._handlers.get(method)
         if not handler:
             if request.id is not None:
                 return self._error(-32601, f"Method not found: {request.method}", request.id)
             return None
 
         try:
-            result = await handler(request.params)
+            result = handler(request.params)
+            # Checked per call: a plain callable (lambda, partial, decorator)
+            # may still return a coroutine
+            if inspect.isawaitable(result):
+                result = await result
             if request.id is None:  # Notification
                 return None
             return Response(result=result, id=request.id).to_dict()
@@ -142,16 +158,18 @@ class JSONRPCServer:
     def notify_sync(self, method: str, params: dict) -> None:
         """Synchronous notification (for use outside async context)."""
         notification = Notification(method=method, params=params)
-        sys.stdout.write(json.dumps(notification.to_dict()) + "\n")
+        line = json.dumps(notification.to_dict(), separators=_SEPARATORS)
+        sys.stdout.write(line + "\n")
         sys.stdout.flush()
 
     async def _write(self, data: dict) -> None:
         """Write JSON line to stdout."""
+        line = json.dumps(data, separators=_SEPARATORS) + "\n"
         if self._writer:
-            self._writer.write((json.dumps(data) + "\n").encode())
+            self._writer.write(line.encode())
             await self._writer.drain()
         else:
-            sys.stdout.write(json.dumps(data) + "\n")
+            sys.stdout.write(line)
             sys.stdout.flush()
 
     def _error(self, code: int, message: str, request_id: Any) -> dict:
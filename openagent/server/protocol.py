@@ -1,10 +1,29 @@
 """JSON-RPC 2.0 protocol types and validation."""
 
 from dataclasses import dataclass, field
-from enum import Enum
-from typing import Any, Literal
+from enum import Enum, StrEnum
+from typing import Any, Callable, Literal
+import functools
 import json
 
+# Both backends write the same text: compact separators, UTF-8 left unescaped
+_loads: Callable[[str | bytes], Any]
+
+try:
+    import orjson
+except ImportError:  # optional: pip install openagent[fast]
+
+    def _dumps(obj: Any) -> str:
+        return json.dumps(obj, separators=(",", ":"), ensure_ascii=False)
+
+    _loads = json.loads
+else:
+
+    def _dumps(obj: Any) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+
+    _loads = orjson.loads
+
 
 class ErrorCode(Enum):
     """Standard JSON-RPC 2.0 error codes."""
@@ -22,7 +41,20 @@ class ErrorCode(Enum):
     CANCELLED = -32004
 
 
-@dataclass
+_DEFAULT_MESSAGES: dict[ErrorCode, str] = {
+    ErrorCode.PARSE_ERROR: "Parse error",
+    ErrorCode.INVALID_REQUEST: "Invalid request",
+    ErrorCode.METHOD_NOT_FOUND: "Method not found",
+    ErrorCode.INVALID_PARAMS: "Invalid params",
+    ErrorCode.INTERNAL_ERROR: "Internal error",
+    ErrorCode.SESSION_NOT_FOUND: "Session not found",
+    ErrorCode.TOOL_NOT_FOUND: "Tool not found",
+    ErrorCode.BUDGET_EXCEEDED: "Token budget exceeded",
+    ErrorCode.CANCELLED: "Request cancelled",
+}
+
+
+@dataclass(frozen=True, slots=True)
 class RPCError:
     """JSON-RPC error object."""
 
@@ -38,26 +70,26 @@ class RPCError:
 
     @classmethod
     def from_code(cls, code: ErrorCode, message: str = "", data: Any = None) -> "RPCError":
-        """Create error from ErrorCode enum."""
-        default_messages = {
-            ErrorCode.PARSE_ERROR: "Parse error",
-            ErrorCode.INVALID_REQUEST: "Invalid request",
-            ErrorCode.METHOD_NOT_FOUND: "Method not found",
-            ErrorCode.INVALID_PARAMS: "Invalid params",
-            ErrorCode.INTERNAL_ERROR: "Internal error",
-            ErrorCode.SESSION_NOT_FOUND: "Session not found",
-            ErrorCode.TOOL_NOT_FOUND: "Tool not found",
-            ErrorCode.BUDGET_EXCEEDED: "Token budget exceeded",
-            ErrorCode.CANCELLED: "Request cancelled",
-        }
+        """Create error from ErrorCode enum (default errors are shared)."""
+        if not message and data is None:
+            return _default_error(code)
         return cls(
             code=code.value,
-            message=message or default_messages.get(code, "Unknown error"),
+            message=message or _DEFAULT_MESSAGES.get(code, "Unknown error"),
             data=data,
         )
 
 
-@dataclass
+@functools.lru_cache(maxsize=32)
+def _default_error(code: ErrorCode) -> RPCError:
+    """Immutable RPCError with the default message for a code."""
+    return RPCError(
+        code=code.value,
+        message=_DEFAULT_MESSAGES.get(code, "Unknown error"),
+    )
+
+
+@dataclass(slots=True)
 class Request:
     """JSON-RPC 2.0 request."""
 
@@ -79,7 +111,7 @@ class Request:
         return d
 
     def to_json(self) -> str:
-        return json.dumps(self.to_dict())
+        return _dumps(self.to_dict())
 
     @classmethod
     def from_dict(cls, data: dict) -> "Request":
@@ -91,11 +123,11 @@ class Request:
         )
 
     @classmethod
-    def from_json(cls, json_str: str) -> "Request":
-        return cls.from_dict(json.loads(json_str))
+    def from_json(cls, json_str: str | bytes) -> "Request":
+        return cls.from_dict(_loads(json_str))
 
 
-@dataclass
+@dataclass(slots=True)
 class Response:
     """JSON-RPC 2.0 response."""
 
@@ -116,7 +148,7 @@ class Response:
         return d
 
     def to_json(self) -> str:
-        return json.dumps(self.to_dict())
+        return _dumps(self.to_dict())
 
     @classmethod
     def success(cls, id: int | str | None, result: Any) -> "Response":
@@ -144,11 +176,11 @@ class Response:
         )
 
     @classmethod
-    def from_json(cls, json_str: str) -> "Response":
-        return cls.from_dict(json.loads(json_str))
+    def from_json(cls, json_str: str | bytes) -> "Response":
+        return cls.from_dict(_loads(json_str))
 
 
-@dataclass
+@dataclass(slots=True)
 class Notification:
     """JSON-RPC 2.0 notification (server -> client, no response)."""
 
@@ -163,7 +195,7 @@ class Notification:
         return d
 
     def to_json(self) -> str:
-        return json.dumps(self.to_dict())
+        return _dumps(self.to_dict())
 
     @classmethod
     def from_dict(cls, data: dict) -> "Notification":
@@ -178,8 +210,8 @@ class Notification:
 # Protocol Method Definitions
 # ============================================================================
 
-class Methods:
-    """Available JSON-RPC methods."""
+class Methods(StrEnum):
+    """Available JSON-RPC methods (members compare equal to their strings)."""
 
     # Chat methods
     CHAT_SEND = "chat.send"
@@ -204,7 +236,11 @@ class Methods:
     RAG_INGEST = "rag.ingest"
 
 
-class Notifications:
+# Built once; validate_request checks membership on every request
+_VALID_METHODS: frozenset[str] = frozenset(m.value for m in Methods)
+
+
+class Notifications(StrEnum):
     """Server -> Client notification methods."""
 
     # Streaming response
@@ -337,12 +373,7 @@ def validate_request(request: Request) -> RPCError | None:
         )
 
     # Check if method exists
-    all_methods = [
-        getattr(Methods, attr)
-        for attr in dir(Methods)
-        if not attr.startswith("_")
-    ]
-    if request.method not in all_methods:
+    if request.method not in _VALID_METHODS:
         return RPCError.from_code(
             ErrorCode.METHOD_NOT_FOUND,
             f"Unknown method: {request.method}",
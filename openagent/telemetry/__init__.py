@@ -5,6 +5,13 @@ from openagent.telemetry.tokens import (
     SessionTokenStats,
     TokenTracker,
     MODEL_PRICING,
+    batch_timestamp,
 )
 
-__all__ = ["TokenUsage", "SessionTokenStats", "TokenTracker", "MODEL_PRICING"]
+__all__ = [
+    "TokenUsage",
+    "SessionTokenStats",
+    "TokenTracker",
+    "MODEL_PRICING",
+    "batch_timestamp",
+]
@@ -1,11 +1,16 @@
 """Token usage tracking and cost estimation."""
 
-from dataclasses import dataclass, field
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field, replace
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import Callable
+from typing import Callable, Iterable, Iterator
 import sqlite3
 
+from openagent.memory.session import is_sqlite_uri
+
 
 # Pricing per 1M tokens (USD) - update as needed
 MODEL_PRICING: dict[str, dict[str, float]] = {
@@ -28,6 +33,61 @@ MODEL_PRICING: dict[str, dict[str, float]] = {
 DEFAULT_PRICING = {"input": 10.0, "output": 30.0}
 
 
+@lru_cache(maxsize=1)
+def _longest_first(model_names: tuple[str, ...]) -> tuple[str, ...]:
+    """Model names ordered for partial matching, sorted once per key set."""
+    return tuple(sorted(model_names, key=len, reverse=True))
+
+
+def _lookup_pricing(model: str) -> dict[str, float]:
+    """Resolve pricing for a model name, falling back to DEFAULT_PRICING.
+
+    Reads MODEL_PRICING on every call, so runtime updates to the table
+    take effect immediately; the partial-match order is only re-sorted
+    when the set of model names changes.
+    """
+    # Try exact match first
+    pricing = MODEL_PRICING.get(model)
+    if pricing:
+        return pricing
+
+    # Try partial match (model names can have version suffixes). Longest
+    # names first so "gpt-4o-mini-..." resolves to gpt-4o-mini, not gpt-4
+    for model_name in _longest_first(tuple(MODEL_PRICING)):
+        if model_name in model:
+            return MODEL_PRICING[model_name]
+    for model_name, model_pricing in MODEL_PRICING.items():
+        if model in model_name:
+            return model_pricing
+
+    return DEFAULT_PRICING
+
+
+# Timestamp shared by every TokenUsage created inside batch_timestamp()
+_batch_ts: ContextVar[datetime | None] = ContextVar("_batch_ts", default=None)
+
+
+def _default_timestamp() -> datetime:
+    """Current batch timestamp if one is active, otherwise now."""
+    return _batch_ts.get() or datetime.now()
+
+
+@contextmanager
+def batch_timestamp(ts: datetime | None = None) -> Iterator[datetime]:
+    """
+    Stamp every TokenUsage created in this block with one timestamp.
+
+    Reads the clock once for a bulk ingest (e.g. before record_many)
+    instead of once per usage.
+    """
+    ts = ts or datetime.now()
+    token = _batch_ts.set(ts)
+    try:
+        yield ts
+    finally:
+        _batch_ts.reset(token)
+
+
 @dataclass
 class TokenUsage:
     """Token usage for a single request."""
@@ -35,7 +95,7 @@ class TokenUsage:
     input_tokens: int
     output_tokens: int
     model: str
-    timestamp: datetime = field(default_factory=datetime.now)
+    timestamp: datetime = field(default_factory=_default_timestamp)
     request_id: str = ""
 
     @property
@@ -45,19 +105,7 @@ class TokenUsage:
 
     def estimated_cost(self) -> float:
         """Estimate cost in USD based on model pricing."""
-        # Try exact match first
-        pricing = MODEL_PRICING.get(self.model)
-
-        # Try partial match (model names can have version suffixes)
-        if not pricing:
-            for model_name, model_pricing in MODEL_PRICING.items():
-                if model_name in self.model or self.model in model_name:
-                    pricing = model_pricing
-                    break
-
-        if not pricing:
-            pricing = DEFAULT_PRICING
-
+        pricing = _lookup_pricing(self.model)
         input_cost = (self.input_tokens / 1_000_000) * pricing["input"]
         output_cost = (self.output_tokens / 1_000_000) * pricing["output"]
 
@@ -100,49 +148,81 @@ class TokenTracker:
     ):
         self.session_id = session_id
         self.db_path = Path(db_path)
+        self._uri = is_sqlite_uri(db_path)
         self.budget = budget
         self._listeners: list[Callable[[TokenUsage], None]] = []
-        self._cache: SessionTokenStats | None = None
+        # Running totals, loaded from the database on first use
+        self._running: SessionTokenStats | None = None
 
     def _get_conn(self) -> sqlite3.Connection:
         """Get a database connection."""
-        conn = sqlite3.connect(self.db_path)
+        conn = sqlite3.connect(self.db_path, uri=self._uri)
         conn.execute("PRAGMA foreign_keys = ON")
         return conn
 
+    _INSERT = """
+    INSERT INTO token_usage
+    (session_id, message_id, input_tokens, output_tokens, model, cost_usd, created_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+    """
+
+    def _row(self, usage: TokenUsage, message_id: int | None, cost: float) -> tuple:
+        """Row values for inserting a usage record."""
+        return (
+            self.session_id,
+            message_id,
+            usage.input_tokens,
+            usage.output_tokens,
+            usage.model,
+            cost,
+            usage.timestamp.isoformat(),
+        )
+
     def record(self, usage: TokenUsage, message_id: int | None = None) -> None:
         """Record token usage to database."""
         cost = usage.estimated_cost()
-
         with self._get_conn() as conn:
-            conn.execute(
-                """
-                INSERT INTO token_usage
-                (session_id, message_id, input_tokens, output_tokens, model, cost_usd, created_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    self.session_id,
-                    message_id,
-                    usage.input_tokens,
-                    usage.output_tokens,
-                    usage.model,
-                    cost,
-                    usage.timestamp.isoformat(),
-                ),
-            )
+            conn.execute(self._INSERT, self._row(usage, message_id, cost))
             conn.commit()
 
-        # Invalidate cache
-        self._cache = None
+        self._add_to_totals(usage, cost)
 
         # Notify listeners
         self._notify(usage)
 
+    def record_many(self, usages: Iterable[TokenUsage]) -> None:
+        """Record several usages in a single transaction."""
+        usages = list(usages)
+        costs = [u.estimated_cost() for u in usages]
+
+        with self._get_conn() as conn:
+            conn.executemany(
+                self._INSERT,
+                [self._row(u, None, c) for u, c in zip(usages, costs)],
+            )
+            conn.commit()
+
+        for usage, cost in zip(usages, costs):
+            self._add_to_totals(usage, cost)
+            self._notify(usage)
+
+    def _add_to_totals(self, usage: TokenUsage, cost: float) -> None:
+        """Fold a newly recorded usage into the running totals."""
+        if self._running is None:
+            return  # Not loaded yet; the first load will include this row
+        self._running.total_input += usage.input_tokens
+        self._running.total_output += usage.output_tokens
+        self._running.total_cost += cost
+        self._running.request_count += 1
+
     def get_session_stats(self) -> SessionTokenStats:
         """Get aggregate stats for current session."""
-        if self._cache is not None:
-            return self._cache
+        return replace(self._totals())
+
+    def _totals(self) -> SessionTokenStats:
+        """Running totals, summed from the database once per tracker."""
+        if self._running is not None:
+            return self._running
 
         with self._get_conn() as conn:
             cursor = conn.execute(
@@ -159,21 +239,21 @@ class TokenTracker:
             )
             row = cursor.fetchone()
 
-        self._cache = SessionTokenStats(
+        self._running = SessionTokenStats(
             total_input=row[0],
             total_output=row[1],
             total_cost=row[2],
             request_count=row[3],
         )
 
-        return self._cache
+        return self._running
 
     def get_budget_remaining(self) -> int | None:
         """Get remaining token budget, if set."""
         if self.budget is None:
             return None
 
-        stats = self.get_session_stats()
+        stats = self._totals()
         return max(0, self.budget - stats.total_tokens)
 
     def get_budget_percentage(self) -> float | None:
@@ -181,7 +261,7 @@ class TokenTracker:
         if self.budget is None:
             return None
 
-        stats = self.get_session_stats()
+        stats = self._totals()
         return min(100.0, (stats.total_tokens / self.budget) * 100)
 
     def is_over_budget(self) -> bool:
@@ -214,7 +294,7 @@ class TokenTracker:
                 SELECT input_tokens, output_tokens, model, created_at
                 FROM token_usage
                 WHERE session_id = ?
-                ORDER BY created_at DESC
+                ORDER BY created_at DESC, id DESC
                 LIMIT ?
                 """,
                 (self.session_id, limit),
@@ -1,13 +1,22 @@
 """Tool execution loop."""
 
-from dataclasses import dataclass, field
+from collections import OrderedDict
+from dataclasses import dataclass, field, replace
 from typing import Any
+import asyncio
+import copy
+import inspect
 import json
 
 from openagent.tools.registry import Tool, ToolRegistry
 
+# Error prefixes shared by execute() and validate_call()
+_UNKNOWN_TOOL = "Unknown tool: "
+_MISSING_PARAM = "Missing required parameter: "
+_INVALID_PARAMS = "Invalid parameters: "
 
-@dataclass
+
+@dataclass(slots=True)
 class ToolCall:
     """A request to call a tool."""
 
@@ -16,7 +25,7 @@ class ToolCall:
     reasoning: str = ""
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ToolResult:
     """Result from a tool execution."""
 
@@ -44,28 +53,74 @@ class ToolExecutor:
         self,
         registry: ToolRegistry,
         max_iterations: int = 10,
+        cache_size: int = 128,
     ):
         self.registry = registry
         self.max_iterations = max_iterations
+        self.cache_size = cache_size
+        # (tool name, canonical params) -> result, for tools marked cacheable.
+        # Only valid for one registry version; cleared when tools change.
+        self._cache: OrderedDict[tuple[str, str], ToolResult] = OrderedDict()
+        self._cache_version = registry.version
 
     async def execute(self, call: ToolCall) -> ToolResult:
         """Execute a single tool call."""
-        tool = self.registry.get(call.name)
+        tool = self._lookup_or_error(call.name)
+        if isinstance(tool, ToolResult):
+            return tool  # Nothing to await on the error paths
+        return await self._invoke(tool, call)
+
+    def _lookup_or_error(self, name: str) -> Tool | ToolResult:
+        """Resolve a tool by name, or the error result if it can't run."""
+        tool = self.registry.get(name)
 
         if not tool:
             return ToolResult(
                 success=False,
-                error=f"Unknown tool: {call.name}",
+                error=_UNKNOWN_TOOL + name,
             )
 
         if not tool.handler:
             return ToolResult(
                 success=False,
-                error=f"Tool {call.name} has no handler (may be MCP-only)",
+                error=f"Tool {name} has no handler (may be MCP-only)",
             )
 
+        return tool
+
+    async def _invoke(self, tool: Tool, call: ToolCall) -> ToolResult:
+        """Run a resolved tool, going through the result cache if it is cacheable."""
+        if not tool.cacheable:
+            return await self._run(tool, call)
+
+        if self._cache_version != self.registry.version:
+            # A tool was registered, replaced or removed since results were cached
+            self._cache.clear()
+            self._cache_version = self.registry.version
+
+        key = (call.name, json.dumps(call.params, sort_keys=True, default=str))
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            # Deep copy so callers can't mutate the cached output
+            return replace(cached, output=copy.deepcopy(cached.output))
+
+        result = await self._run(tool, call)
+        if result.success:
+            self._cache[key] = replace(result, output=copy.deepcopy(result.output))
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return result
+
+    async def _run(self, tool: Tool, call: ToolCall) -> ToolResult:
+        """Call the tool's handler and wrap its outcome."""
+        handler = tool.handler
+        assert handler is not None  # _lookup_or_error rejects handler-less tools
         try:
-            result = await tool.handler(**call.params)
+            result = handler(**call.params)
+            # Plain functions return their value directly; only await coroutines
+            if inspect.isawaitable(result):
+                result = await result
             return ToolResult(success=True, output=result)
         except Exception as e:
             return ToolResult(success=False, error=str(e))
@@ -73,31 +128,61 @@ class ToolExecutor:
     async def execute_batch(
         self,
         calls: list[ToolCall],
+        max_concurrency: int = 1,
     ) -> list[ToolResult]:
-        """Execute multiple tool calls sequentially."""
-        results = []
-        for call in calls:
-            result = await self.execute(call)
-            results.append(result)
-        return results
+        """
+        Execute multiple tool calls, returning results in call order.
+
+        Calls run one at a time by default, since tools may have ordered side
+        effects (write a file, then read it). Pass max_concurrency > 1 to let
+        up to that many calls overlap when they are known to be independent.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        # Resolve each distinct tool once, however many calls use it
+        resolved = {name: self._lookup_or_error(name) for name in {c.name for c in calls}}
+
+        async def _bounded(call: ToolCall) -> ToolResult:
+            tool = resolved[call.name]
+            if isinstance(tool, ToolResult):
+                return tool
+            async with semaphore:
+                return await self._invoke(tool, call)
+
+        raw = await asyncio.gather(
+            *(_bounded(call) for call in calls),
+            return_exceptions=True,
+        )
+        return [
+            ToolResult(success=False, error=str(r)) if isinstance(r, BaseException) else r
+            for r in raw
+        ]
 
     def validate_call(self, call: ToolCall) -> tuple[bool, str]:
         """
         Validate a tool call before execution.
 
+        Required parameters are always checked. The rest of the schema
+        (types, enums, ...) is only enforced when the optional fastjsonschema
+        extra is installed; without it, such calls pass validation.
+
         Returns (is_valid, error_message).
         """
-        tool = self.registry.get(call.name)
+        entry = self.registry.get_validator(call.name)
 
-        if not tool:
-            return False, f"Unknown tool: {call.name}"
+        if entry is None:
+            return False, _UNKNOWN_TOOL + call.name
 
         # Validate required parameters
-        schema = tool.input_schema
-        required = schema.get("required", [])
-
+        required, check = entry
+        params = call.params
         for param in required:
-            if param not in call.params:
-                return False, f"Missing required parameter: {param}"
+            if param not in params:
+                return False, _MISSING_PARAM + param
+
+        # Full schema check (types, enums, ...) when fastjsonschema is installed
+        if check is not None:
+            error = check(params)
+            if error is not None:
+                return False, _INVALID_PARAMS + error
 
         return True, ""
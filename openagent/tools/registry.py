@@ -1,18 +1,65 @@
 """Tool registration and discovery."""
 
 from dataclasses import dataclass, field
+from functools import lru_cache
 from typing import Any, Callable, Awaitable
-
-
-@dataclass
+import copy
+import json
+import sys
+
+try:
+    import fastjsonschema
+except ImportError:  # optional: pip install openagent[fast]
+    _HAS_FASTJSONSCHEMA = False
+else:
+    _HAS_FASTJSONSCHEMA = True
+
+# Checks params against a tool's schema; returns an error message or None
+SchemaCheck = Callable[[dict], str | None]
+
+
+@lru_cache(maxsize=256)
+def _compile_schema(schema_json: str) -> SchemaCheck | None:
+    """
+    Compile a JSON schema into a check, or None if fastjsonschema is missing.
+
+    Raises ValueError if the schema itself is invalid.
+    """
+    if not _HAS_FASTJSONSCHEMA:
+        return None
+    try:
+        # use_default=False: validation must not write schema defaults into params
+        validate = fastjsonschema.compile(json.loads(schema_json), use_default=False)
+    except fastjsonschema.JsonSchemaDefinitionException as e:
+        raise ValueError(f"Invalid input schema: {e}") from e
+
+    def check(params: dict) -> str | None:
+        try:
+            validate(params)
+        except fastjsonschema.JsonSchemaException as e:
+            return str(e.message)
+        return None
+
+    return check
+
+
+def _schema_validator(schema: dict) -> SchemaCheck | None:
+    """Compiled validator for a tool's input schema (shared by equal schemas)."""
+    if not schema:
+        return None
+    return _compile_schema(json.dumps(schema, sort_keys=True, default=str))
+
+
+@dataclass(slots=True)
 class Tool:
     """A callable tool."""
 
     name: str
     description: str
     input_schema: dict = field(default_factory=dict)
-    handler: Callable[..., Awaitable[Any]] | None = None
+    handler: Callable[..., Awaitable[Any] | Any] | None = None  # async or plain function
     server: str = ""  # MCP server name, if external
+    cacheable: bool = False  # Pure tool: same params always give the same output
 
     def to_dict(self) -> dict:
         """Convert to dictionary for JSON serialization."""
@@ -29,17 +76,48 @@ class ToolRegistry:
 
     def __init__(self):
         self._tools: dict[str, Tool] = {}
+        # name -> (required params, compiled schema), precomputed for ToolExecutor.
+        # Built from the schema at register() time: re-register a tool after
+        # changing its input_schema.
+        self._validator: dict[str, tuple[tuple[str, ...], SchemaCheck | None]] = {}
+        self._version = 0  # Bumped on every change so callers can cache derived data
+        self._llm_format: tuple[int, list[dict]] | None = None
+
+    @property
+    def version(self) -> int:
+        """Counter bumped whenever a tool is registered, replaced or removed."""
+        return self._version
 
     def register(self, tool: Tool) -> None:
-        """Register a tool."""
+        """
+        Register a tool.
+
+        The input schema is compiled here; call register() again after
+        changing ``tool.input_schema`` so validation picks it up. Raises
+        ValueError for an invalid schema (only detectable when fastjsonschema
+        is installed).
+        """
+        try:
+            check = _schema_validator(tool.input_schema)
+        except ValueError as e:
+            raise ValueError(f"Tool {tool.name}: {e}") from e
+
+        # Interned keys let repeated lookups short-circuit on identity
+        tool.name = sys.intern(tool.name)
         self._tools[tool.name] = tool
+        self._validator[tool.name] = (
+            tuple(tool.input_schema.get("required", ())),
+            check,
+        )
+        self._version += 1
 
     def register_function(
         self,
         name: str,
         description: str,
-        handler: Callable[..., Awaitable[Any]],
+        handler: Callable[..., Awaitable[Any] | Any],
         input_schema: dict | None = None,
+        cacheable: bool = False,
     ) -> Tool:
         """Register a function as a tool."""
         tool = Tool(
@@ -47,6 +125,7 @@ class ToolRegistry:
             description=description,
             input_schema=input_schema or {},
             handler=handler,
+            cacheable=cacheable,
         )
         self.register(tool)
         return tool
@@ -55,6 +134,12 @@ class ToolRegistry:
         """Get a tool by name."""
         return self._tools.get(name)
 
+    def get_validator(
+        self, name: str
+    ) -> tuple[tuple[str, ...], SchemaCheck | None] | None:
+        """Get (required params, compiled schema check) for a tool, or None."""
+        return self._validator.get(name)
+
     def list_all(self) -> list[Tool]:
         """List all registered tools."""
         return list(self._tools.values())
@@ -67,15 +152,26 @@ class ToolRegistry:
         """Unregister a tool."""
         if name in self._tools:
             del self._tools[name]
+            del self._validator[name]
+            self._version += 1
             return True
         return False
 
     def clear(self) -> None:
         """Clear all registered tools."""
         self._tools.clear()
+        self._validator.clear()
+        self._version += 1
 
     def to_llm_format(self) -> list[dict]:
         """Convert tools to LLM function-calling format."""
+        if self._llm_format is None or self._llm_format[0] != self._version:
+            self._llm_format = (self._version, self._build_llm_format())
+        # Deep copy so callers editing an entry can't corrupt later prompts
+        return copy.deepcopy(self._llm_format[1])
+
+    def _build_llm_format(self) -> list[dict]:
+        """Build the function-calling entries for the current tools."""
         return [
             {
                 "type": "function",
@@ -1,12 +1,16 @@
 """Shared pytest fixtures."""
 
+import asyncio
+import os
 import pytest
 from pathlib import Path
 import tempfile
 import shutil
+import sqlite3
 from unittest.mock import MagicMock, AsyncMock
 
 from openagent.core.llm import LLMClient, LLMResponse
+from openagent.memory.session import SessionManager
 
 
 class MockLLMClient(LLMClient):
@@ -61,16 +65,66 @@ class MockLLMClient(LLMClient):
             yield word + " "
 
 
+@pytest.hookimpl(optionalhook=True)
+def pytest_asyncio_loop_factories(config, item):
+    """Run async tests on uvloop when it is installed."""
+    try:
+        import uvloop
+    except ImportError:
+        return {"asyncio": asyncio.new_event_loop}
+    return {"uvloop": uvloop.new_event_loop}
+
+
 @pytest.fixture
 def mock_llm_client():
     """Provide a mock LLM client."""
     return MockLLMClient()
 
 
+@pytest.fixture(scope="session")
+def _db_template(tmp_path_factory) -> Path:
+    """Build the session database schema once per test run."""
+    path = tmp_path_factory.mktemp("db_template") / "template.db"
+    SessionManager(path)
+    # WAL is stored in the file header, so every copy inherits it; commits then
+    # append to the WAL instead of syncing a rollback journal
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.close()
+    return path
+
+
+@pytest.fixture
+def tmp_db_path(tmp_path: Path, _db_template: Path) -> Path:
+    """Provide a temporary database path, pre-populated with the schema."""
+    db_path = tmp_path / "test.db"
+    shutil.copyfile(_db_template, db_path)
+    return db_path
+
+
+# Tests that only need a working SessionManager share one in-memory database;
+# the schema is created once per test run. The name is keyed by xdist worker
+# so parallel workers never share a database.
+_WORKER_ID = os.environ.get("PYTEST_XDIST_WORKER", "master")
+SHARED_DB_URI = f"file:oa_shared_test_{_WORKER_ID}?mode=memory&cache=shared"
+
+
+@pytest.fixture(scope="session")
+def shared_db():
+    """Keep the shared in-memory database alive for the whole run."""
+    keepalive = sqlite3.connect(SHARED_DB_URI, uri=True)
+    SessionManager.init_schema(keepalive)
+    yield keepalive
+    keepalive.close()
+
+
 @pytest.fixture
-def tmp_db_path(tmp_path: Path) -> Path:
-    """Provide a temporary database path."""
-    return tmp_path / "test.db"
+def session_manager(shared_db) -> SessionManager:
+    """Session manager on the shared database, emptied after each test."""
+    yield SessionManager(SHARED_DB_URI, init_schema=False)
+    shared_db.executescript(
+        "DELETE FROM token_usage; DELETE FROM messages; DELETE FROM sessions;"
+    )
 
 
 @pytest.fixture
@@ -21,7 +21,7 @@ from openagent.memory.context import (
     SummarizationRequest,
 )
 from openagent.memory.session import SessionManager
-from openagent.memory.conversation import ConversationHistory
+from openagent.memory.conversation import ConversationHistory, SQLiteConversationHistory
 
 
 class TestContextConfig:
@@ -93,7 +93,7 @@ class TestContextManager:
         """Create a conversation history with test data."""
         session_mgr = SessionManager(tmp_db_path)
         session = session_mgr.create(name="Test")
-        history = ConversationHistory(session, tmp_db_path)
+        history = SQLiteConversationHistory(session, tmp_db_path)
 
         # Add some messages
         history.add("user", "Hello!", token_count=5)
@@ -151,11 +151,60 @@ class TestContextManager:
         contents = [m["content"] for m in window.messages]
         assert any("Python" in c for c in contents)
 
+    def test_build_reuses_cached_window(self, manager: ContextManager, history: ConversationHistory):
+        """Test repeated builds on unchanged history reuse the cached prefix."""
+        first = manager.build(history=history, user_message="Hi", system_prompt="Sys")
+        second = manager.build(history=history, user_message="Yo", system_prompt="Sys")
+
+        assert len(manager._window_cache) == 1
+        assert second.messages[:-1] == first.messages[:-1]
+        assert second.messages[-1] == {"role": "user", "content": "Yo"}
+        assert second.total_tokens == first.total_tokens
+
+    def test_build_cached_messages_are_copies(self, manager: ContextManager, history: ConversationHistory):
+        """Test mutating a returned window doesn't change later builds."""
+        first = manager.build(history=history, user_message="Hi", system_prompt="Sys")
+        first.messages[0]["content"] = "tampered"
+
+        second = manager.build(history=history, user_message="Hi", system_prompt="Sys")
+
+        assert second.messages[0] == {"role": "system", "content": "Sys"}
+
+    def test_build_cache_tracks_config_changes(self, manager: ContextManager, history: ConversationHistory):
+        """Test changing the config after a build isn't masked by the cache."""
+        full = manager.build(history=history, user_message="Hi")
+
+        manager.config.recent_messages = 1
+        trimmed = manager.build(history=history, user_message="Hi")
+
+        assert trimmed.included_message_count == 2  # one history message + user
+        assert trimmed.included_message_count < full.included_message_count
+
+    def test_build_cache_invalidated_by_new_message(self, manager: ContextManager, history: ConversationHistory):
+        """Test adding a message produces a fresh window."""
+        manager.build(history=history, user_message="Hi")
+        history.add("assistant", "Something new", token_count=3)
+
+        window = manager.build(history=history, user_message="Hi")
+
+        assert window.messages[-2]["content"] == "Something new"
+
+    def test_build_cache_sees_other_writers(self, manager: ContextManager, history: ConversationHistory):
+        """Test writes through another history object invalidate the cached window."""
+        manager.build(history=history, user_message="Hi")
+        other = SQLiteConversationHistory(history.session, history.db_path)
+
+        other.add("assistant", "From elsewhere", token_count=3)
+        assert manager.build(history=history, user_message="Hi").messages[-2]["content"] == "From elsewhere"
+
+        other.clear(keep_system=False)
+        assert manager.build(history=history, user_message="Hi").included_message_count == 1
+
     def test_build_respects_token_budget(self, tmp_db_path: Path):
         """Test that token budget is respected."""
         session_mgr = SessionManager(tmp_db_path)
         session = session_mgr.create(name="Test")
-        history = ConversationHistory(session, tmp_db_path)
+        history = SQLiteConversationHistory(session, tmp_db_path)
 
         # Add many large messages
         for i in range(20):
@@ -175,6 +224,22 @@ class TestContextManager:
         assert window.total_tokens <= config.available_for_context
         assert window.included_message_count < 40  # Not all messages
 
+    def test_build_keeps_newest_messages(self, tmp_db_path: Path):
+        """Test budget truncation drops the oldest recent messages first."""
+        session_mgr = SessionManager(tmp_db_path)
+        session = session_mgr.create(name="Test")
+        history = SQLiteConversationHistory(session, tmp_db_path)
+        for i in range(5):
+            history.add("user", f"Message {i}", token_count=100)
+
+        manager = ContextManager(ContextConfig(max_tokens=300, reserved_for_response=0))
+        window = manager.build(history=history, user_message="Hi")
+
+        contents = [m["content"] for m in window.messages]
+        assert contents == ["Message 3", "Message 4", "Hi"]
+        assert window.truncated is True
+        assert window.total_tokens == 200 + manager._estimate_tokens("Hi")
+
     def test_build_simple(self, manager: ContextManager):
         """Test simple context building from message list."""
         from openagent.memory.conversation import Message
@@ -214,7 +279,7 @@ class TestContextManager:
         """Test summarization triggered for long history."""
         session_mgr = SessionManager(tmp_db_path)
         session = session_mgr.create(name="Test")
-        history = ConversationHistory(session, tmp_db_path)
+        history = SQLiteConversationHistory(session, tmp_db_path)
 
         # Add many messages
         for i in range(35):
@@ -226,6 +291,31 @@ class TestContextManager:
 
         assert manager.should_summarize(history) is True
 
+    def test_should_summarize_tokens_opt_in(self, history: ConversationHistory):
+        """Test token-based trigger is used when summarize_after_tokens is set."""
+        # 80 tokens in history, far below the message-count threshold
+        low = ContextManager(ContextConfig(summarize_after_tokens=50))
+        high = ContextManager(ContextConfig(summarize_after_tokens=500))
+
+        assert low.should_summarize(history) is True
+        assert high.should_summarize(history) is False
+
+    def test_window_tokens_weights_previous_window(self):
+        """Test previous-window tokens are weighted by remaining overlap."""
+        from openagent.memory.conversation import Message
+        from datetime import datetime, timedelta
+
+        manager = ContextManager(ContextConfig(summarize_window_seconds=30))
+        # A quarter of the way into the current window
+        now = datetime.fromtimestamp(3000 + 7.5)
+        messages = [
+            Message(1, "sess", "user", "old", 1000, now - timedelta(seconds=60), {}),
+            Message(2, "sess", "user", "previous", 100, now - timedelta(seconds=20), {}),
+            Message(3, "sess", "user", "current", 10, now - timedelta(seconds=5), {}),
+        ]
+
+        assert manager._window_tokens(messages, now) == 10 + 0.75 * 100
+
     def test_set_and_get_summary(self, manager: ContextManager):
         """Test summary caching."""
         session_id = "test-session"
@@ -1,6 +1,7 @@
 """Tests for conversation history."""
 
 import pytest
+from dataclasses import fields, replace
 from pathlib import Path
 
 from openagent.memory.session import SessionManager
@@ -23,6 +24,12 @@ class TestMessage:
 
         assert d == {"role": "user", "content": "Hello!"}
 
+    def test_uses_slots(self):
+        """Test Message instances carry no per-instance __dict__."""
+        msg = Message(id=1, session_id="abc123", role="user", content="Hello!")
+
+        assert not hasattr(msg, "__dict__")
+
 
 class TestConversationHistory:
     """Tests for ConversationHistory class."""
@@ -59,6 +66,28 @@ class TestConversationHistory:
 
         assert msg.metadata["tool_name"] == "search"
 
+    def test_metadata_round_trip(self, history: ConversationHistory):
+        """Test metadata read back from the database decodes lazily."""
+        history.add(role="tool", content="Tool output", metadata={"tool_name": "search"})
+
+        msg = history.get_all()[0]
+
+        assert msg._metadata_raw == '{"tool_name": "search"}'
+        assert msg.metadata == {"tool_name": "search"}
+        assert msg._metadata_raw is None
+
+    def test_metadata_is_a_compared_field(self, history: ConversationHistory):
+        """Test lazily decoded metadata still takes part in equality and replace()."""
+        history.add(role="tool", content="Tool output", metadata={"tool_name": "search"})
+
+        msg = history.get_all()[0]
+        other = history.get_all()[0]
+
+        assert "metadata" in [f.name for f in fields(Message)]
+        assert msg == other
+        assert msg != replace(other, metadata={"tool_name": "other"})
+        assert replace(msg, content="x").metadata == {"tool_name": "search"}
+
     def test_get_all(self, history: ConversationHistory):
         """Test getting all messages."""
         history.add(role="system", content="System prompt")
@@ -85,6 +114,17 @@ class TestConversationHistory:
         assert recent[1].content == "Message 8"
         assert recent[2].content == "Message 9"
 
+    def test_get_recent_soa(self, history: ConversationHistory):
+        """Test recent messages as parallel role/content/token arrays."""
+        for i in range(4):
+            history.add(role="user", content=f"Message {i}", token_count=i)
+
+        roles, contents, tokens = history.get_recent_soa(limit=2)
+
+        assert roles == ["user", "user"]
+        assert contents == ["Message 2", "Message 3"]
+        assert tokens.tolist() == [2, 3]
+
     def test_get_by_token_budget(self, history: ConversationHistory):
         """Test getting messages by token budget."""
         history.add(role="system", content="System", token_count=10)
@@ -100,6 +140,17 @@ class TestConversationHistory:
         total_tokens = sum(m.token_count for m in messages)
         assert total_tokens <= 400 or any(m.role == "system" for m in messages)
 
+    def test_get_by_token_budget_keeps_contiguous_tail(self, history: ConversationHistory):
+        """Test budget selection stops at the first message that doesn't fit."""
+        history.add(role="system", content="System", token_count=10)
+        history.add(role="user", content="Old", token_count=5)
+        history.add(role="assistant", content="Big", token_count=300)
+        history.add(role="user", content="Recent", token_count=50)
+
+        messages = history.get_by_token_budget(max_tokens=100)
+
+        assert [m.content for m in messages] == ["System", "Recent"]
+
     def test_to_llm_format(self, history: ConversationHistory):
         """Test converting to LLM format."""
         history.add(role="system", content="System prompt")
@@ -152,6 +203,54 @@ class TestConversationHistory:
 
         assert history.get_total_tokens() == 15
 
+    def test_stats(self, history: ConversationHistory):
+        """Test fused count and token total."""
+        assert history.stats() == (0, 0)
+
+        history.add(role="user", content="Hello!", token_count=5)
+        history.add(role="assistant", content="Hi there!", token_count=10)
+
+        assert history.stats() == (2, 15)
+
     def test_empty_total_tokens(self, history: ConversationHistory):
         """Test total tokens on empty history."""
         assert history.get_total_tokens() == 0
+
+    def test_total_tokens_after_clear(self, history: ConversationHistory):
+        """Test running token total follows clear()."""
+        history.add(role="system", content="System prompt", token_count=7)
+        history.add(role="user", content="Hello!", token_count=5)
+
+        history.clear(keep_system=True)
+        assert history.get_total_tokens() == 7
+
+        history.clear(keep_system=False)
+        assert history.get_total_tokens() == 0
+
+    def test_total_tokens_loaded_from_db(self, history: ConversationHistory):
+        """Test a new history picks up tokens already stored."""
+        history.add(role="user", content="Hello!", token_count=5)
+
+        reopened = SQLiteConversationHistory(history.session, history.db_path)
+
+        assert reopened.get_total_tokens() == 5
+
+    def test_stats_see_other_writers(self, history: ConversationHistory):
+        """Test totals reflect writes made through another history object."""
+        other = SQLiteConversationHistory(history.session, history.db_path)
+        history.add(role="user", content="Hello!", token_count=5)
+
+        msg = other.add(role="assistant", content="Hi there!", token_count=10)
+
+        assert history.stats() == (2, 15)
+        assert history.last_message_id == msg.id
+
+    def test_stats_after_session_delete(self, history: ConversationHistory):
+        """Test totals drop to zero when the session is deleted (cascade)."""
+        history.add(role="user", content="Hello!", token_count=5)
+
+        SessionManager(history.db_path).delete(history.session.id)
+
+        assert history.stats() == (0, 0)
+        assert history.count() == 0
+        assert history.last_message_id is None
@@ -13,23 +13,33 @@
 
 import pytest
 from pathlib import Path
-from unittest.mock import AsyncMock, MagicMock, patch
-import numpy as np
+from unittest.mock import MagicMock
 
 from openagent.server.handlers import Handlers, create_handlers
 from openagent.memory.session import SessionManager
 from openagent.rag.store import RAGStore, Chunk, ChunkMetadata
 
 
+# RAGStore attribute names, computed once. Spec'ing mocks from a list skips
+# re-introspecting the class for every test.
+RAG_STORE_SPEC = dir(RAGStore)
+
+
 class TestHandlers:
     """Tests for Handlers class."""
 
     @pytest.fixture
-    def handlers(self, tmp_db_path: Path) -> Handlers:
+    def handlers(self, session_manager: SessionManager) -> Handlers:
         """Create handlers with test database."""
-        session_manager = SessionManager(tmp_db_path)
         return Handlers(session_manager=session_manager)
 
+    @pytest.fixture
+    async def loaded_handlers(self, handlers: Handlers) -> Handlers:
+        """Handlers with a session already created and loaded."""
+        created = await handlers.session_create({"name": "fixture"})
+        await handlers.session_load({"id": created["id"]})
+        return handlers
+
     @pytest.mark.asyncio
     async def test_session_create(self, handlers: Handlers):
         """Test creating a new session."""
@@ -78,11 +88,11 @@ class TestHandlers:
         assert "error" in result
 
     @pytest.mark.asyncio
-    async def test_session_list(self, handlers: Handlers):
+    async def test_session_list(
+        self, handlers: Handlers, session_manager: SessionManager
+    ):
         """Test listing sessions."""
-        # Create some sessions
-        await handlers.session_create({"name": "Session 1"})
-        await handlers.session_create({"name": "Session 2"})
+        session_manager.create_many(["Session 1", "Session 2"])
 
         result = await handlers.session_list({})
 
@@ -90,10 +100,11 @@ class TestHandlers:
         assert len(result["sessions"]) == 2
 
     @pytest.mark.asyncio
-    async def test_session_list_with_limit(self, handlers: Handlers):
+    async def test_session_list_with_limit(
+        self, handlers: Handlers, session_manager: SessionManager
+    ):
         """Test listing sessions with limit."""
-        for i in range(5):
-            await handlers.session_create({"name": f"Session {i}"})
+        session_manager.create_many([f"Session {i}" for i in range(5)])
 
         result = await handlers.session_list({"limit": 3})
 
@@ -122,26 +133,18 @@ class TestHandlers:
         assert result["request_count"] == 0
 
     @pytest.mark.asyncio
-    async def test_tokens_get_with_session(self, handlers: Handlers):
+    async def test_tokens_get_with_session(self, loaded_handlers: Handlers):
         """Test getting tokens after session is loaded."""
-        # Create and load a session (initializes token tracker)
-        created = await handlers.session_create({"name": "Test"})
-        await handlers.session_load({"id": created["id"]})
-
-        result = await handlers.tokens_get({})
+        result = await loaded_handlers.tokens_get({})
 
         assert "total_input" in result
         assert "total_output" in result
         assert "total_cost" in result
 
     @pytest.mark.asyncio
-    async def test_tokens_set_budget(self, handlers: Handlers):
+    async def test_tokens_set_budget(self, loaded_handlers: Handlers):
         """Test setting token budget."""
-        # Create and load session first
-        created = await handlers.session_create({"name": "Test"})
-        await handlers.session_load({"id": created["id"]})
-
-        result = await handlers.tokens_set_budget({"budget": 10000})
+        result = await loaded_handlers.tokens_set_budget({"budget": 10000})
 
         assert result["budget"] == 10000
 
@@ -153,13 +156,9 @@ class TestHandlers:
         assert "error" in result
 
     @pytest.mark.asyncio
-    async def test_chat_send_empty_message(self, handlers: Handlers):
+    async def test_chat_send_empty_message(self, loaded_handlers: Handlers):
         """Test chat with empty message."""
-        # Initialize session
-        created = await handlers.session_create({"name": "Test"})
-        await handlers.session_load({"id": created["id"]})
-
-        result = await handlers.chat_send({"message": ""})
+        result = await loaded_handlers.chat_send({"message": ""})
 
         assert "error" in result
 
@@ -181,6 +180,12 @@ class TestHandlers:
 class TestCreateHandlers:
     """Tests for create_handlers factory function."""
 
+    @pytest.fixture(scope="session")
+    def registered_handlers(self, tmp_path_factory) -> dict:
+        """Build the handler map once; tests only read it."""
+        tmp = tmp_path_factory.mktemp("create_handlers")
+        return create_handlers(db_path=tmp / "test.db", rag_db_path=tmp / "chroma")
+
     def test_create_handlers_default_path(self, tmp_path: Path, monkeypatch):
         """Test creating handlers with default path."""
         # Monkeypatch home to tmp_path
@@ -194,15 +199,15 @@ class TestCreateHandlers:
 
     def test_create_handlers_custom_path(self, tmp_db_path: Path):
         """Test creating handlers with custom path."""
-        handlers = create_handlers(db_path=tmp_db_path)
+        handlers = create_handlers(db_path=tmp_db_path, rag_db_path=tmp_db_path.parent / "chroma")
 
         assert "chat.send" in handlers
         assert "session.create" in handlers
+        session_manager = handlers["session.create"].__self__.session_manager
+        assert session_manager.db_path == tmp_db_path
 
-    def test_all_methods_registered(self, tmp_db_path: Path):
+    def test_all_methods_registered(self, registered_handlers: dict):
         """Test all expected methods are registered."""
-        handlers = create_handlers(db_path=tmp_db_path)
-
         expected_methods = [
             "chat.send",
             "chat.cancel",
@@ -220,7 +225,42 @@ class TestCreateHandlers:
         ]
 
         for method in expected_methods:
-            assert method in handlers, f"Missing handler for {method}"
+            assert method in registered_handlers, f"Missing handler for {method}"
+
+    async def test_create_handlers_returns_independent_handlers(self, tmp_path: Path):
+        """Test repeated calls get separate handlers over the same databases."""
+        db_path = tmp_path / "test.db"
+        rag_db_path = tmp_path / "chroma"
+
+        first = create_handlers(db_path=db_path, rag_db_path=rag_db_path)
+        second = create_handlers(db_path=str(db_path), rag_db_path=rag_db_path)
+
+        first_handlers = first["session.create"].__self__
+        second_handlers = second["session.create"].__self__
+        assert first_handlers is not second_handlers
+        assert first_handlers.session_manager is second_handlers.session_manager
+
+        await first_handlers.session_create({"name": "only-in-first"})
+        assert first_handlers._current_session is not None
+        assert second_handlers._current_session is None
+
+    def test_create_handlers_retries_failed_rag_init(self, tmp_path: Path, monkeypatch, caplog):
+        """Test a failed RAG open is logged and not cached for later calls."""
+        import openagent.server.handlers as handlers_module
+
+        def broken_store(db_path: str) -> RAGStore:
+            raise RuntimeError("disk unavailable")
+
+        monkeypatch.setattr(handlers_module, "RAGStore", broken_store)
+        first = create_handlers(db_path=tmp_path / "test.db", rag_db_path=tmp_path / "chroma")
+
+        assert first["rag.search"].__self__.rag_store is None
+        assert "Could not initialize RAG: disk unavailable" in caplog.text
+
+        monkeypatch.undo()
+        second = create_handlers(db_path=tmp_path / "test.db", rag_db_path=tmp_path / "chroma")
+
+        assert isinstance(second["rag.search"].__self__.rag_store, RAGStore)
 
 
 class TestRagEmbeddings:
@@ -229,17 +269,23 @@ class TestRagEmbeddings:
     @pytest.fixture
     def mock_rag_store(self, tmp_path: Path):
         """Create a mock RAG store with test data."""
-        store = MagicMock(spec=RAGStore)
+        import numpy as np
+
+        store = MagicMock(spec=RAG_STORE_SPEC)
 
-        # Mock the _collection.get() method to return test embeddings
+        # Mock the _collection.get() method to return test embeddings the way
+        # Chroma does: a float32 array rather than nested lists
         mock_collection = MagicMock()
         mock_collection.get.return_value = {
             "ids": ["chunk1", "chunk2", "chunk3"],
-            "embeddings": [
-                [0.1, 0.2, 0.3, 0.4],  # 4-dim embeddings for testing
-                [0.5, 0.6, 0.7, 0.8],
-                [0.9, 0.1, 0.2, 0.3],
-            ],
+            "embeddings": np.array(
+                [
+                    [0.1, 0.2, 0.3, 0.4],  # 4-dim embeddings for testing
+                    [0.5, 0.6, 0.7, 0.8],
+                    [0.9, 0.1, 0.2, 0.3],
+                ],
+                dtype=np.float32,
+            ),
             "metadatas": [
                 {"path": "src/main.py", "type": "function"},
                 {"path": "src/utils.py", "type": "class"},
@@ -250,9 +296,8 @@ class TestRagEmbeddings:
         return store
 
     @pytest.fixture
-    def handlers_with_rag(self, tmp_db_path: Path, mock_rag_store) -> Handlers:
+    def handlers_with_rag(self, session_manager: SessionManager, mock_rag_store) -> Handlers:
         """Create handlers with mock RAG store."""
-        session_manager = SessionManager(tmp_db_path)
         return Handlers(
             session_manager=session_manager,
             rag_store=mock_rag_store,
@@ -299,9 +344,34 @@ class TestRagEmbeddings:
         assert chunk1["type"] == "function"
 
     @pytest.mark.asyncio
-    async def test_rag_embeddings_no_store(self, tmp_db_path: Path):
+    async def test_rag_embeddings_accepts_lists(
+        self, handlers_with_rag: Handlers, mock_rag_store
+    ):
+        """Test that plain list-of-lists embeddings are still projected."""
+        returned = mock_rag_store._collection.get.return_value
+        returned["embeddings"] = returned["embeddings"].tolist()
+
+        result = await handlers_with_rag.rag_embeddings({})
+
+        assert result["count"] == 3
+
+    @pytest.mark.asyncio
+    async def test_rag_embeddings_empty_array(
+        self, handlers_with_rag: Handlers, mock_rag_store
+    ):
+        """Test that an empty embeddings array returns no points."""
+        import numpy as np
+
+        returned = mock_rag_store._collection.get.return_value
+        returned["embeddings"] = np.empty((0, 4), dtype=np.float32)
+
+        result = await handlers_with_rag.rag_embeddings({})
+
+        assert result == {"points": [], "count": 0}
+
+    @pytest.mark.asyncio
+    async def test_rag_embeddings_no_store(self, session_manager: SessionManager):
         """Test rag_embeddings when RAG store is not initialized."""
-        session_manager = SessionManager(tmp_db_path)
         handlers = Handlers(session_manager=session_manager, rag_store=None)
 
         result = await handlers.rag_embeddings({})
@@ -310,9 +380,9 @@ class TestRagEmbeddings:
         assert result["points"] == []
 
     @pytest.mark.asyncio
-    async def test_rag_embeddings_empty_collection(self, tmp_db_path: Path):
+    async def test_rag_embeddings_empty_collection(self, session_manager: SessionManager):
         """Test rag_embeddings with empty collection."""
-        store = MagicMock(spec=RAGStore)
+        store = MagicMock(spec=RAG_STORE_SPEC)
         mock_collection = MagicMock()
         mock_collection.get.return_value = {
             "ids": [],
@@ -321,7 +391,6 @@ class TestRagEmbeddings:
         }
         store._collection = mock_collection
 
-        session_manager = SessionManager(tmp_db_path)
         handlers = Handlers(session_manager=session_manager, rag_store=store)
 
         result = await handlers.rag_embeddings({})
@@ -330,46 +399,55 @@ class TestRagEmbeddings:
         assert result["count"] == 0
 
 
-class TestStreamingTokens:
-    """Tests for streaming with token stats in done notification."""
-
-    @pytest.fixture
-    def mock_agent(self):
-        """Create a mock agent that streams responses."""
-        agent = MagicMock()
-
-        # Mock chat_stream to yield chunks
-        async def mock_stream(*args, **kwargs):
-            yield "Hello"
-            yield " world"
-            yield "!"
-
-        agent.chat_stream = mock_stream
-        agent.get_intent.return_value = None
+class _StubStats:
+    """Session stats stub returning fixed token counts."""
 
-        # Mock token tracker
-        mock_stats = MagicMock()
-        mock_stats.to_dict.return_value = {
+    def to_dict(self) -> dict:
+        return {
             "total_input": 10,
             "total_output": 20,
             "total_tokens": 30,
             "total_cost": 0.001,
             "request_count": 1,
         }
-        agent.token_tracker = MagicMock()
-        agent.token_tracker.get_session_stats.return_value = mock_stats
 
-        return agent
+
+class _StubTracker:
+    """Token tracker stub."""
+
+    def get_session_stats(self) -> _StubStats:
+        return _StubStats()
+
+
+class _StubAgent:
+    """Agent stub that streams a fixed response."""
+
+    token_tracker = _StubTracker()
+
+    def get_intent(self, message: str) -> None:
+        return None
+
+    async def chat_stream(self, *args, **kwargs):
+        for chunk in ("Hello", " world", "!"):
+            yield chunk
+
+
+class TestStreamingTokens:
+    """Tests for streaming with token stats in done notification."""
+
+    @pytest.fixture
+    def mock_agent(self):
+        """Create a stub agent that streams responses."""
+        return _StubAgent()
 
     @pytest.mark.asyncio
-    async def test_streaming_done_includes_tokens(self, tmp_db_path: Path, mock_agent):
+    async def test_streaming_done_includes_tokens(self, session_manager: SessionManager, mock_agent):
         """Test that streaming done notification includes token stats."""
         notifications = []
 
         async def capture_notify(method: str, params: dict):
             notifications.append((method, params))
 
-        session_manager = SessionManager(tmp_db_path)
         handlers = Handlers(
             session_manager=session_manager,
             agent=mock_agent,
@@ -394,14 +472,13 @@ class TestStreamingTokens:
         assert params["tokens"]["total_output"] == 20
 
     @pytest.mark.asyncio
-    async def test_streaming_sends_chunks(self, tmp_db_path: Path, mock_agent):
+    async def test_streaming_sends_chunks(self, session_manager: SessionManager, mock_agent):
         """Test that streaming sends chunk notifications."""
         notifications = []
 
         async def capture_notify(method: str, params: dict):
             notifications.append((method, params))
 
-        session_manager = SessionManager(tmp_db_path)
         handlers = Handlers(
             session_manager=session_manager,
             agent=mock_agent,
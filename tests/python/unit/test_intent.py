@@ -8,137 +8,150 @@ from openagent.core.intent import Intent, IntentType
 class TestIntent:
     """Tests for Intent dataclass."""
 
-    def test_from_dict_research(self):
-        """Test creating research intent from dict."""
-        data = {
-            "intent_type": "research",
-            "entities": "auth, login, token",
-            "action": "search",
-            "query": "How does authentication work?",
-            "reasoning": "User wants to understand auth flow",
-        }
-
-        intent = Intent.from_dict(data)
-
-        assert intent.type == IntentType.RESEARCH
-        assert intent.entities == ["auth", "login", "token"]
-        assert intent.action == "search"
-        assert intent.query == "How does authentication work?"
-        assert intent.reasoning == "User wants to understand auth flow"
-
-    def test_from_dict_organize(self):
-        """Test creating organize intent from dict."""
-        data = {
-            "intent_type": "organize",
-            "entities": ["notes", "ideas"],
-            "action": "answer",
-            "query": "",
-            "reasoning": "User wants to structure their thoughts",
-        }
-
-        intent = Intent.from_dict(data)
-
-        assert intent.type == IntentType.ORGANIZE
-        assert intent.action == "answer"
-
-    def test_from_dict_control(self):
-        """Test creating control intent from dict."""
-        data = {
-            "intent_type": "control",
-            "entities": "main.py",
-            "action": "execute",
-            "query": "",
-            "reasoning": "User wants to run code",
-        }
-
-        intent = Intent.from_dict(data)
-
-        assert intent.type == IntentType.CONTROL
-        assert intent.action == "execute"
-
-    def test_from_dict_unknown_type(self):
-        """Test fallback to research for unknown type."""
-        data = {
-            "intent_type": "unknown_type",
-            "entities": "",
-            "action": "search",
-            "query": "query",
-            "reasoning": "",
-        }
-
-        intent = Intent.from_dict(data)
-
-        assert intent.type == IntentType.RESEARCH
-
-    def test_from_dict_entities_list(self):
-        """Test entities as list."""
-        data = {
-            "intent_type": "research",
-            "entities": ["auth", "login"],
-            "action": "search",
-            "query": "query",
-            "reasoning": "",
-        }
-
-        intent = Intent.from_dict(data)
-
-        assert intent.entities == ["auth", "login"]
-
-    def test_from_dict_entities_string(self):
-        """Test entities as comma-separated string."""
-        data = {
-            "intent_type": "research",
-            "entities": "auth, login, token",
-            "action": "search",
-            "query": "query",
-            "reasoning": "",
-        }
-
-        intent = Intent.from_dict(data)
-
-        assert intent.entities == ["auth", "login", "token"]
-
-    def test_from_dict_empty_entities(self):
-        """Test empty entities."""
-        data = {
-            "intent_type": "research",
-            "entities": "",
-            "action": "search",
-            "query": "query",
-            "reasoning": "",
-        }
-
-        intent = Intent.from_dict(data)
-
-        assert intent.entities == []
-
-    def test_from_dict_defaults(self):
-        """Test default values."""
-        data = {}
-
-        intent = Intent.from_dict(data)
-
-        assert intent.type == IntentType.RESEARCH
-        assert intent.entities == []
-        assert intent.action == "search"
-        assert intent.query == ""
-        assert intent.reasoning == ""
-        assert intent.confidence == 1.0
-
-    def test_from_dict_with_confidence(self):
-        """Test custom confidence score."""
-        data = {
-            "intent_type": "research",
-            "entities": "",
-            "action": "search",
-            "query": "query",
-            "reasoning": "",
-            "confidence": 0.85,
-        }
-
+    @pytest.mark.parametrize(
+        "data,expected_type,expected_entities,expected_action,expected_confidence",
+        [
+            pytest.param(
+                {
+                    "intent_type": "research",
+                    "entities": "auth, login, token",
+                    "action": "search",
+                    "query": "How does authentication work?",
+                    "reasoning": "User wants to understand auth flow",
+                },
+                IntentType.RESEARCH,
+                ["auth", "login", "token"],
+                "search",
+                1.0,
+                id="research",
+            ),
+            pytest.param(
+                {
+                    "intent_type": "organize",
+                    "entities": ["notes", "ideas"],
+                    "action": "answer",
+                    "query": "",
+                    "reasoning": "User wants to structure their thoughts",
+                },
+                IntentType.ORGANIZE,
+                ["notes", "ideas"],
+                "answer",
+                1.0,
+                id="organize",
+            ),
+            pytest.param(
+                {
+                    "intent_type": "control",
+                    "entities": "main.py",
+                    "action": "execute",
+                    "query": "",
+                    "reasoning": "User wants to run code",
+                },
+                IntentType.CONTROL,
+                ["main.py"],
+                "execute",
+                1.0,
+                id="control",
+            ),
+            pytest.param(
+                {"intent_type": "unknown_type", "entities": "", "action": "search"},
+                IntentType.RESEARCH,
+                [],
+                "search",
+                1.0,
+                id="unknown_type",
+            ),
+            pytest.param(
+                {"intent_type": "research", "entities": ["auth", "login"]},
+                IntentType.RESEARCH,
+                ["auth", "login"],
+                "search",
+                1.0,
+                id="entities_list",
+            ),
+            pytest.param(
+                {"intent_type": "research", "entities": "auth, login, token"},
+                IntentType.RESEARCH,
+                ["auth", "login", "token"],
+                "search",
+                1.0,
+                id="entities_string",
+            ),
+            pytest.param(
+                {"intent_type": "research", "entities": ""},
+                IntentType.RESEARCH,
+                [],
+                "search",
+                1.0,
+                id="empty_entities",
+            ),
+            pytest.param(
+                {},
+                IntentType.RESEARCH,
+                [],
+                "search",
+                1.0,
+                id="defaults",
+            ),
+            pytest.param(
+                {"intent_type": "research", "entities": "", "confidence": 0.85},
+                IntentType.RESEARCH,
+                [],
+                "search",
+                0.85,
+                id="with_confidence",
+            ),
+        ],
+    )
+    def test_from_dict(
+        self,
+        data,
+        expected_type,
+        expected_entities,
+        expected_action,
+        expected_confidence,
+    ):
+        """Test creating Intent from dict."""
         intent = Intent.from_dict(data)
 
-        assert intent.confidence == 0.85
+        assert intent.type == expected_type
+        assert intent.entities == expected_entities
+        assert intent.action == expected_action
+        assert intent.query == data.get("query", "")
+        assert intent.reasoning == data.get("reasoning", "")
+        assert intent.confidence == expected_confidence
+
+    @pytest.mark.parametrize(
+        "intent_type,expected",
+        [
+            ("research", IntentType.RESEARCH),
+            ("organize", IntentType.ORGANIZE),
+            ("control", IntentType.CONTROL),
+            ("unknown_type", IntentType.RESEARCH),
+            (None, IntentType.RESEARCH),
+            (["control"], IntentType.RESEARCH),
+            ({"type": "control"}, IntentType.RESEARCH),
+        ],
+    )
+    def test_from_dict_intent_types(self, intent_type, expected):
+        """Test intent type lookup with research fallback."""
+        intent = Intent.from_dict({"intent_type": intent_type})
+
+        assert intent.type == expected
+
+    @pytest.mark.parametrize(
+        "entities,expected",
+        [
+            (" auth ,login,  token ", ["auth", "login", "token"]),
+            ("auth,,login", ["auth", "login"]),
+            (" , ", []),
+        ],
+    )
+    def test_from_dict_entities_whitespace(self, entities, expected):
+        """Test entity splitting trims whitespace and drops empties."""
+        intent = Intent.from_dict({"entities": entities})
+
+        assert intent.entities == expected
 
 
 class TestIntentType:
@@ -150,8 +163,14 @@ class TestIntentType:
         assert IntentType.ORGANIZE.value == "organize"
         assert IntentType.CONTROL.value == "control"
 
-    def test_from_string(self):
+    @pytest.mark.parametrize(
+        "value,expected",
+        [
+            ("research", IntentType.RESEARCH),
+            ("organize", IntentType.ORGANIZE),
+            ("control", IntentType.CONTROL),
+        ],
+    )
+    def test_from_string(self, value, expected):
         """Test creating from string."""
-        assert IntentType("research") == IntentType.RESEARCH
-        assert IntentType("organize") == IntentType.ORGANIZE
-        assert IntentType("control") == IntentType.CONTROL
+        assert IntentType(value) == expected
@@ -13,10 +13,26 @@
 import pytest
 import json
 import asyncio
+import functools
+import sys
+from types import MappingProxyType
 
 from openagent.server.jsonrpc import JSONRPCServer
 from openagent.server.protocol import Request, Response, ErrorCode
 
+# Shared request envelope; read-only so tests can't mutate it by accident
+_BASE_RPC = MappingProxyType({"jsonrpc": "2.0"})
+
+
+def make_rpc(method: str, params: dict | None = None, id=1) -> dict:
+    """Build a fresh request dict; ``id=None`` makes a notification."""
+    request = {**_BASE_RPC, "method": method}
+    if params is not None:
+        request["params"] = params
+    if id is not None:
+        request["id"] = id
+    return request
+
 
 class TestJSONRPCServer:
     """Tests for JSONRPCServer class."""
@@ -52,6 +68,16 @@ class TestJSONRPCServer:
         assert "method.one" in server._handlers
         assert "method.two" in server._handlers
 
+    def test_register_interns_method_names(self, server: JSONRPCServer):
+        """Test registered method names are interned for dispatch."""
+        async def my_handler(params: dict) -> str:
+            return "ok"
+
+        server.register("".join(["test", ".method"]), my_handler)
+
+        key = next(iter(server._handlers))
+        assert key is sys.intern("test.method")
+
     def test_register_overwrites(self, server: JSONRPCServer):
         """Test that registering same method overwrites."""
         async def handler1(params: dict) -> str:
@@ -73,12 +99,7 @@ class TestJSONRPCServer:
 
         server.register("echo", echo)
 
-        request_data = {
-            "jsonrpc": "2.0",
-            "method": "echo",
-            "params": {"message": "hello"},
-            "id": 1,
-        }
+        request_data = make_rpc("echo", {"message": "hello"})
 
         response = await server._handle(request_data)
 
@@ -86,6 +107,46 @@ class TestJSONRPCServer:
         assert response["result"] == {"echo": "hello"}
         assert response["id"] == 1
 
+    @pytest.mark.asyncio
+    async def test_handle_sync_handler(self, server: JSONRPCServer):
+        """Test plain (non-async) handlers are called directly."""
+        def echo(params: dict) -> dict:
+            return {"echo": params.get("message", "")}
+
+        server.register("echo", echo)
+
+        response = await server._handle(make_rpc("echo", {"message": "hello"}))
+
+        assert response["result"] == {"echo": "hello"}
+
+    @pytest.mark.asyncio
+    async def test_handle_plain_callable_returning_coroutine(self, server: JSONRPCServer):
+        """Test awaitables returned by non-async callables are awaited."""
+        async def echo(prefix: str, params: dict) -> dict:
+            return {"echo": prefix + params.get("message", "")}
+
+        server.register("echo", functools.partial(echo, ">"))
+        server.register("lambda", lambda params: echo("", params))
+
+        response = await server._handle(make_rpc("echo", {"message": "hello"}))
+        assert response["result"] == {"echo": ">hello"}
+
+        response = await server._handle(make_rpc("lambda", {"message": "hi"}))
+        assert response["result"] == {"echo": "hi"}
+
+    @pytest.mark.asyncio
+    async def test_handle_does_not_mutate_request(self, server: JSONRPCServer):
+        """Test requests are treated as read-only."""
+        def echo(params: dict) -> dict:
+            return {"echo": params.get("message", "")}
+
+        server.register("echo", echo)
+
+        request_data = MappingProxyType(make_rpc("echo", {"message": "hello"}))
+        response = await server._handle(request_data)
+
+        assert response["result"] == {"echo": "hello"}
+
     @pytest.mark.asyncio
     async def test_handle_error(self, server: JSONRPCServer):
         """Test error handling in request."""
@@ -94,11 +155,7 @@ class TestJSONRPCServer:
 
         server.register("fail", failing)
 
-        request_data = {
-            "jsonrpc": "2.0",
-            "method": "fail",
-            "id": 1,
-        }
+        request_data = make_rpc("fail")
 
         response = await server._handle(request_data)
 
@@ -117,12 +174,7 @@ class TestJSONRPCServer:
 
         server.register("notify", notify_handler)
 
-        request_data = {
-            "jsonrpc": "2.0",
-            "method": "notify",
-            "params": {},
-            # No id = notification
-        }
+        request_data = make_rpc("notify", {}, id=None)
 
         response = await server._handle(request_data)
 
@@ -132,11 +184,7 @@ class TestJSONRPCServer:
     @pytest.mark.asyncio
     async def test_handle_unknown_method(self, server: JSONRPCServer):
         """Test handling of unknown method."""
-        request_data = {
-            "jsonrpc": "2.0",
-            "method": "unknown.method",
-            "id": 1,
-        }
+        request_data = make_rpc("unknown.method")
 
         response = await server._handle(request_data)
 
@@ -146,11 +194,7 @@ class TestJSONRPCServer:
     @pytest.mark.asyncio
     async def test_handle_unknown_method_notification(self, server: JSONRPCServer):
         """Test unknown method as notification returns nothing."""
-        request_data = {
-            "jsonrpc": "2.0",
-            "method": "unknown.method",
-            # No id = notification
-        }
+        request_data = make_rpc("unknown.method", id=None)
 
         response = await server._handle(request_data)
 
@@ -166,6 +210,14 @@ class TestJSONRPCServer:
         assert error_resp["error"]["code"] == -32600
         assert error_resp["error"]["message"] == "Invalid request"
 
+    @pytest.mark.asyncio
+    async def test_write_compact_json(self, server: JSONRPCServer, capsys):
+        """Test responses are written as compact JSON lines."""
+        await server._write({"jsonrpc": "2.0", "id": 1, "result": [1, 2]})
+
+        out = capsys.readouterr().out
+        assert out == '{"jsonrpc":"2.0","id":1,"result":[1,2]}\n'
+
     def test_stop(self, server: JSONRPCServer):
         """Test stopping the server."""
         server._running = True
@@ -177,9 +229,9 @@ class TestJSONRPCServer:
 class TestJSONRPCIntegration:
     """Integration tests for JSON-RPC request/response cycles."""
 
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def server(self) -> JSONRPCServer:
-        """Create server with test handlers."""
+        """Create server with test handlers (shared; tests only dispatch)."""
         server = JSONRPCServer()
 
         async def add(params: dict) -> int:
@@ -206,24 +258,14 @@ class TestJSONRPCIntegration:
     @pytest.mark.asyncio
     async def test_math_operation(self, server: JSONRPCServer):
         """Test math operation request."""
-        response = await server._handle({
-            "jsonrpc": "2.0",
-            "method": "math.add",
-            "params": {"a": 5, "b": 3},
-            "id": 1,
-        })
+        response = await server._handle(make_rpc("math.add", {"a": 5, "b": 3}))
 
         assert response["result"] == 8
 
     @pytest.mark.asyncio
     async def test_string_operation(self, server: JSONRPCServer):
         """Test string operation request."""
-        response = await server._handle({
-            "jsonrpc": "2.0",
-            "method": "greet",
-            "params": {"name": "Alice"},
-            "id": "req-1",
-        })
+        response = await server._handle(make_rpc("greet", {"name": "Alice"}, id="req-1"))
 
         assert response["result"] == "Hello, Alice!"
         assert response["id"] == "req-1"
@@ -231,12 +273,7 @@ class TestJSONRPCIntegration:
     @pytest.mark.asyncio
     async def test_complex_response(self, server: JSONRPCServer):
         """Test complex object response."""
-        response = await server._handle({
-            "jsonrpc": "2.0",
-            "method": "data.get",
-            "params": {},
-            "id": 100,
-        })
+        response = await server._handle(make_rpc("data.get", {}, id=100))
 
         assert response["result"]["items"] == [1, 2, 3]
         assert response["result"]["count"] == 3
@@ -244,11 +281,6 @@ class TestJSONRPCIntegration:
     @pytest.mark.asyncio
     async def test_default_params(self, server: JSONRPCServer):
         """Test handler with default params."""
-        response = await server._handle({
-            "jsonrpc": "2.0",
-            "method": "greet",
-            "id": 1,
-            # No params - should use default
-        })
+        response = await server._handle(make_rpc("greet"))
 
         assert response["result"] == "Hello, World!"
@@ -10,135 +10,152 @@
 
 import pytest
 import asyncio
-from unittest.mock import MagicMock, patch
 from dataclasses import dataclass
+from types import SimpleNamespace
 
 from openagent.core.llm import AzureOpenAIClient, LLMResponse
 
 
-class MockChunk:
-    """Mock streaming chunk from OpenAI."""
+@dataclass(slots=True)
+class _Delta:
+    content: str | None
 
-    def __init__(self, content: str | None):
-        self.choices = [MagicMock()]
-        self.choices[0].delta.content = content
+
+@dataclass(slots=True)
+class _Choice:
+    delta: _Delta
+
+
+@dataclass(slots=True)
+class _Chunk:
+    """Streaming chunk shaped like the OpenAI SDK's."""
+
+    choices: tuple[_Choice, ...]
+
+
+def make_chunk(content: str | None) -> _Chunk:
+    """Build a single-choice streaming chunk."""
+    return _Chunk(choices=(_Choice(delta=_Delta(content=content)),))
 
 
 class MockStreamResponse:
-    """Mock streaming response that yields chunks."""
+    """Async-iterable streaming response over prebuilt chunks."""
 
-    def __init__(self, chunks: list[str]):
+    __slots__ = ("chunks",)
+
+    def __init__(self, chunks):
         self.chunks = chunks
-        self.index = 0
 
-    def __iter__(self):
-        return self
+    async def __aiter__(self):
+        for chunk in self.chunks:
+            # Hand control back to the loop, as awaiting the network would
+            await asyncio.sleep(0)
+            yield chunk
+
+
+class _FakeClient:
+    """Async OpenAI client stub whose create() returns a fixed response."""
+
+    def __init__(self):
+        self.response: MockStreamResponse | None = None
+        self.calls: list[dict] = []
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def reset(self) -> None:
+        """Forget the previous test's response and calls."""
+        self.response = None
+        self.calls.clear()
+
+    async def create(self, **params) -> MockStreamResponse:
+        self.calls.append(params)
+        return self.response
+
+
+_CLIENT = _FakeClient()
+
 
-    def __next__(self):
-        if self.index >= len(self.chunks):
-            raise StopIteration
-        chunk = MockChunk(self.chunks[self.index])
-        self.index += 1
-        return chunk
+@pytest.fixture(scope="session")
+def llm_factory():
+    """Build AzureOpenAIClient instances around a stub async client."""
+
+    def make(client: _FakeClient) -> AzureOpenAIClient:
+        # Bypass __init__, which needs config and builds real SDK clients
+        llm = AzureOpenAIClient.__new__(AzureOpenAIClient)
+        llm._async_client = client
+        llm.model = "gpt-4o"
+        return llm
+
+    return make
 
 
 class TestLLMStreaming:
     """Tests for async streaming behavior."""
 
     @pytest.fixture
-    def mock_client(self):
-        """Create a mock OpenAI client."""
-        client = MagicMock()
-        return client
+    def mock_client(self) -> _FakeClient:
+        """Shared stub async OpenAI client, reset for each test."""
+        _CLIENT.reset()
+        return _CLIENT
 
     @pytest.mark.asyncio
-    async def test_stream_yields_chunks(self, mock_client):
+    async def test_stream_yields_chunks(self, mock_client, llm_factory):
         """Test that stream yields chunks asynchronously."""
-        # Setup mock to return streaming response
-        mock_client.chat.completions.create.return_value = MockStreamResponse(
-            ["Hello", " ", "world", "!"]
+        # Setup stub to return streaming response
+        mock_client.response = MockStreamResponse(
+            [make_chunk(c) for c in ["Hello", " ", "world", "!"]]
         )
 
-        with patch.object(AzureOpenAIClient, "__init__", lambda self: None):
-            llm = AzureOpenAIClient()
-            llm._client = mock_client
-            llm.model = "gpt-4o"
+        llm = llm_factory(mock_client)
 
-            chunks = []
-            async for chunk in llm.stream(
-                messages=[{"role": "user", "content": "test"}]
-            ):
-                chunks.append(chunk)
+        chunks = []
+        async for chunk in llm.stream(
+            messages=[{"role": "user", "content": "test"}]
+        ):
+            chunks.append(chunk)
 
-            assert chunks == ["Hello", " ", "world", "!"]
+        assert chunks == ["Hello", " ", "world", "!"]
 
     @pytest.mark.asyncio
-    async def test_stream_handles_empty_chunks(self, mock_client):
+    async def test_stream_handles_empty_chunks(self, mock_client, llm_factory):
         """Test that stream handles None content in chunks."""
         # Some chunks might have None content (e.g., role-only chunks)
-        mock_response = MagicMock()
-        mock_response.__iter__ = lambda self: iter([
-            MockChunk("Hello"),
-            MockChunk(None),  # Empty chunk
-            MockChunk(" world"),
-        ])
-        mock_client.chat.completions.create.return_value = mock_response
-
-        with patch.object(AzureOpenAIClient, "__init__", lambda self: None):
-            llm = AzureOpenAIClient()
-            llm._client = mock_client
-            llm.model = "gpt-4o"
-
-            chunks = []
-            async for chunk in llm.stream(
-                messages=[{"role": "user", "content": "test"}]
-            ):
-                chunks.append(chunk)
+        mock_client.response = MockStreamResponse((
+            make_chunk("Hello"),
+            make_chunk(None),  # Empty chunk
+            make_chunk(" world"),
+        ))
+
+        llm = llm_factory(mock_client)
 
-            assert chunks == ["Hello", " world"]
+        chunks = []
+        async for chunk in llm.stream(
+            messages=[{"role": "user", "content": "test"}]
+        ):
+            chunks.append(chunk)
+
+        assert chunks == ["Hello", " world"]
 
     @pytest.mark.asyncio
-    async def test_stream_does_not_block_event_loop(self, mock_client):
-        """Test that streaming doesn't block the event loop."""
-        import time
-
-        # Create a slow mock that simulates network delay
-        def slow_iter():
-            for chunk in ["chunk1", "chunk2", "chunk3"]:
-                time.sleep(0.01)  # Small delay
-                yield MockChunk(chunk)
-
-        mock_response = MagicMock()
-        mock_response.__iter__ = lambda self: slow_iter()
-        mock_client.chat.completions.create.return_value = mock_response
-
-        with patch.object(AzureOpenAIClient, "__init__", lambda self: None):
-            llm = AzureOpenAIClient()
-            llm._client = mock_client
-            llm.model = "gpt-4o"
-
-            # Track if other tasks can run while streaming
-            other_task_ran = False
-
-            async def other_task():
-                nonlocal other_task_ran
-                await asyncio.sleep(0.005)
-                other_task_ran = True
-
-            async def stream_task():
-                chunks = []
-                async for chunk in llm.stream(
-                    messages=[{"role": "user", "content": "test"}]
-                ):
-                    chunks.append(chunk)
-                return chunks
-
-            # Run both tasks concurrently
-            results = await asyncio.gather(stream_task(), other_task())
-
-            # The other task should have been able to run
-            assert other_task_ran, "Event loop was blocked by streaming"
-            assert results[0] == ["chunk1", "chunk2", "chunk3"]
+    async def test_stream_does_not_block_event_loop(self, mock_client, llm_factory):
+        """Test that streaming goes through the native async client."""
+        mock_client.response = MockStreamResponse(
+            [make_chunk(c) for c in ["chunk1", "chunk2", "chunk3"]]
+        )
+
+        llm = llm_factory(mock_client)
+        # Any use of the blocking sync client would raise
+        llm._client = None
+
+        chunks = [
+            chunk
+            async for chunk in llm.stream(
+                messages=[{"role": "user", "content": "test"}]
+            )
+        ]
+
+        assert chunks == ["chunk1", "chunk2", "chunk3"]
+        assert len(mock_client.calls) == 1
+        assert mock_client.calls[0]["stream"] is True
 
 
 class TestLLMResponse:
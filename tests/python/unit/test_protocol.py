@@ -12,6 +12,7 @@
 """
 
 import pytest
+import dataclasses
 import json
 
 from openagent.server.protocol import (
@@ -29,35 +30,44 @@ from openagent.server.protocol import (
 class TestRequest:
     """Tests for Request dataclass."""
 
-    def test_to_dict_minimal(self):
-        """Test minimal request serialization."""
-        req = Request(method="test.method", id=1)
-        d = req.to_dict()
-
-        assert d == {
-            "jsonrpc": "2.0",
-            "method": "test.method",
-            "id": 1,
-        }
-
-    def test_to_dict_with_params(self):
-        """Test request with params serialization."""
-        req = Request(
-            method="chat.send",
-            params={"message": "Hello"},
-            id=1,
-        )
-        d = req.to_dict()
-
-        assert d["params"] == {"message": "Hello"}
-
-    def test_to_json(self):
-        """Test JSON string output."""
-        req = Request(method="test", id=1)
-        j = req.to_json()
-
-        parsed = json.loads(j)
-        assert parsed["method"] == "test"
+    @pytest.mark.parametrize(
+        "kwargs,expected",
+        [
+            pytest.param(
+                {"method": "test.method", "id": 1},
+                {"jsonrpc": "2.0", "method": "test.method", "id": 1},
+                id="minimal",
+            ),
+            pytest.param(
+                {"method": "chat.send", "params": {"message": "Hello"}, "id": 1},
+                {
+                    "jsonrpc": "2.0",
+                    "method": "chat.send",
+                    "params": {"message": "Hello"},
+                    "id": 1,
+                },
+                id="with_params",
+            ),
+            pytest.param(
+                {"method": "test", "id": "abc-123"},
+                {"jsonrpc": "2.0", "method": "test", "id": "abc-123"},
+                id="string_id",
+            ),
+            pytest.param(
+                {"method": "test", "params": {}, "id": 1},
+                {"jsonrpc": "2.0", "method": "test", "id": 1},
+                id="empty_params_not_included",
+            ),
+            pytest.param(
+                {"method": "status"},
+                {"jsonrpc": "2.0", "method": "status"},
+                id="notification_has_no_id",
+            ),
+        ],
+    )
+    def test_to_dict(self, kwargs, expected):
+        """Test request serialization."""
+        assert Request(**kwargs).to_dict() == expected
 
     def test_from_dict(self):
         """Test request deserialization."""
@@ -73,37 +83,25 @@ class TestRequest:
         assert req.params == {"name": "Test"}
         assert req.id == 42
 
-    def test_from_json(self):
-        """Test request from JSON string."""
-        json_str = '{"jsonrpc": "2.0", "method": "test", "id": 1}'
+    @pytest.mark.parametrize(
+        "json_str",
+        [
+            '{"jsonrpc": "2.0", "method": "test", "id": 1}',
+            b'{"jsonrpc":"2.0","method":"test","id":1}',
+        ],
+        ids=["str", "bytes"],
+    )
+    def test_from_json(self, json_str):
+        """Test request from JSON text or raw bytes."""
         req = Request.from_json(json_str)
 
         assert req.method == "test"
         assert req.id == 1
 
-    def test_is_notification_true(self):
+    @pytest.mark.parametrize("id,expected", [(None, True), (1, False), ("x", False)])
+    def test_is_notification(self, id, expected):
         """Test notification detection (no id)."""
-        req = Request(method="status", id=None)
-        assert req.is_notification() is True
-
-    def test_is_notification_false(self):
-        """Test non-notification (has id)."""
-        req = Request(method="test", id=1)
-        assert req.is_notification() is False
-
-    def test_string_id(self):
-        """Test request with string ID."""
-        req = Request(method="test", id="abc-123")
-        d = req.to_dict()
-
-        assert d["id"] == "abc-123"
-
-    def test_empty_params_not_included(self):
-        """Test that empty params are not included in dict."""
-        req = Request(method="test", params={}, id=1)
-        d = req.to_dict()
-
-        assert "params" not in d
+        assert Request(method="status", id=id).is_notification() is expected
 
 
 class TestResponse:
@@ -151,13 +149,37 @@ class TestResponse:
         assert d["error"]["message"] == "Method not found"
         assert "result" not in d
 
-    def test_to_json(self):
-        """Test JSON output."""
-        resp = Response.success(id=1, result="test")
-        j = resp.to_json()
+    def test_json_round_trip(self):
+        """Test to_json output parses back to an equal response."""
+        resp = Response.failure(
+            id=7, error=RPCError.from_code(ErrorCode.INTERNAL_ERROR, data={"x": 1})
+        )
+
+        assert Response.from_json(resp.to_json().encode()) == resp
+
+    def test_to_json_wire_format(self):
+        """Test to_json writes compact, unescaped UTF-8 with or without orjson."""
+        resp = Response.success(id=1, result={"name": "café"})
+
+        assert resp.to_json() == '{"jsonrpc":"2.0","id":1,"result":{"name":"café"}}'
 
-        parsed = json.loads(j)
-        assert parsed["result"] == "test"
+    def test_plain_response_equals_factory_response(self):
+        """Test directly built responses match the factory variants."""
+        error = RPCError(code=-32600, message="Invalid request")
+
+        assert Response(id=1, result="ok") == Response.success(id=1, result="ok")
+        assert Response(id=1, error=error) == Response.failure(id=1, error=error)
+        assert Response(id=1, error=error).to_dict() == (
+            Response.failure(id=1, error=error).to_dict()
+        )
+
+    def test_to_dict_follows_error_field(self):
+        """Test to_dict reflects an error set after construction."""
+        error = RPCError(code=-32603, message="Internal error")
+        resp = Response.success(id=1, result="ok")
+        resp.error = error
+
+        assert resp.to_dict() == {"jsonrpc": "2.0", "id": 1, "error": error.to_dict()}
 
     def test_from_dict_success(self):
         """Test success response deserialization."""
@@ -206,15 +228,6 @@ class TestNotification:
         }
         assert "id" not in d
 
-    def test_to_json(self):
-        """Test JSON output."""
-        notif = Notification(method="status", params={"ready": True})
-        j = notif.to_json()
-
-        parsed = json.loads(j)
-        assert parsed["method"] == "status"
-        assert "id" not in parsed
-
     def test_from_dict(self):
         """Test notification deserialization."""
         data = {
@@ -282,6 +295,50 @@ class TestRPCError:
 
         assert err.data == {"field": "message"}
 
+    def test_from_code_default_is_shared(self):
+        """Test default errors are reused rather than rebuilt."""
+        first = RPCError.from_code(ErrorCode.METHOD_NOT_FOUND)
+
+        assert RPCError.from_code(ErrorCode.METHOD_NOT_FOUND) is first
+        assert RPCError.from_code(ErrorCode.METHOD_NOT_FOUND, "custom") is not first
+
+    def test_errors_are_immutable(self):
+        """Test shared error instances cannot be modified."""
+        err = RPCError.from_code(ErrorCode.INTERNAL_ERROR)
+
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            err.message = "changed"  # type: ignore[misc]
+
+
+@pytest.mark.parametrize(
+    "message",
+    [
+        Request(method="test", params={"a": 1}, id=1),
+        Response.success(id=1, result="test"),
+        Response.failure(id=2, error=RPCError(code=-32601, message="Not found")),
+        Notification(method="status", params={"ready": True}),
+    ],
+    ids=["request", "success", "failure", "notification"],
+)
+def test_to_json_matches_to_dict(message):
+    """Test to_json encodes exactly what to_dict returns."""
+    assert json.loads(message.to_json()) == message.to_dict()
+
+
+@pytest.mark.parametrize(
+    "message",
+    [
+        Request(method="test", id=1),
+        Response.success(id=1, result="ok"),
+        Notification(method="status"),
+        RPCError.from_code(ErrorCode.INTERNAL_ERROR),
+    ],
+    ids=lambda m: type(m).__name__,
+)
+def test_protocol_types_use_slots(message):
+    """Test protocol messages are slotted (no per-instance __dict__)."""
+    assert not hasattr(message, "__dict__")
+
 
 class TestErrorCode:
     """Tests for ErrorCode enum."""
@@ -322,6 +379,12 @@ class TestMethods:
         assert Methods.TOKENS_GET == "tokens.get"
         assert Methods.TOKENS_SET_BUDGET == "tokens.set_budget"
 
+    def test_methods_are_strings(self):
+        """Test members behave as plain strings when compared or encoded."""
+        assert isinstance(Methods.CHAT_SEND, str)
+        assert Methods("chat.send") is Methods.CHAT_SEND
+        assert json.dumps({"method": Methods.CHAT_SEND}) == '{"method": "chat.send"}'
+
 
 class TestNotifications:
     """Tests for Notifications constants."""
@@ -375,3 +438,8 @@ class TestValidateRequest:
 
         assert error is not None
         assert error.code == ErrorCode.METHOD_NOT_FOUND.value
+
+    @pytest.mark.parametrize("method", [m.value for m in Methods])
+    def test_all_declared_methods_valid(self, method):
+        """Test every declared method passes validation."""
+        assert validate_request(Request(method=method, id=1)) is None
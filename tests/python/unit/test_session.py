@@ -1,11 +1,16 @@
 """Tests for session management."""
 
 import pytest
-from datetime import datetime
+import sqlite3
+from datetime import datetime, timedelta
 from pathlib import Path
 
+import openagent.memory.session as session_module
 from openagent.memory.session import Session, SessionManager
 
+_FIXTURE_PATH_STR = "/home/user/project"
+_FIXTURE_PATH = Path(_FIXTURE_PATH_STR)
+
 
 class TestSession:
     """Tests for Session dataclass."""
@@ -15,14 +20,14 @@ class TestSession:
         session = Session(
             id="abc123",
             name="Test Session",
-            codebase_path=Path("/home/user/project"),
+            codebase_path=_FIXTURE_PATH,
             metadata={"key": "value"},
         )
         d = session.to_dict()
 
         assert d["id"] == "abc123"
         assert d["name"] == "Test Session"
-        assert d["codebase_path"] == "/home/user/project"
+        assert d["codebase_path"] == _FIXTURE_PATH_STR
         assert d["metadata"] == {"key": "value"}
         assert "created_at" in d
         assert "last_accessed" in d
@@ -30,13 +35,13 @@ class TestSession:
     def test_from_row(self):
         """Test creation from database row."""
         now = datetime.now().isoformat()
-        row = ("abc123", "Test Session", "/home/user/project", now, now, '{"key": "value"}')
+        row = ("abc123", "Test Session", _FIXTURE_PATH_STR, now, now, '{"key": "value"}')
 
         session = Session.from_row(row)
 
         assert session.id == "abc123"
         assert session.name == "Test Session"
-        assert session.codebase_path == Path("/home/user/project")
+        assert session.codebase_path == _FIXTURE_PATH
         assert session.metadata == {"key": "value"}
 
     def test_from_row_null_codebase(self):
@@ -53,10 +58,24 @@ class TestSession:
 class TestSessionManager:
     """Tests for SessionManager class."""
 
+    @pytest.fixture(autouse=True)
+    def fast_clock(self, monkeypatch):
+        """Make datetime.now() advance 1µs per call instead of sleeping."""
+        base = datetime(2024, 1, 1)
+        ticks = [0]
+
+        class TickingDatetime(datetime):
+            @classmethod
+            def now(cls, tz=None):
+                ticks[0] += 1
+                return base + timedelta(microseconds=ticks[0])
+
+        monkeypatch.setattr(session_module, "datetime", TickingDatetime)
+
     @pytest.fixture
-    def manager(self, tmp_db_path: Path) -> SessionManager:
-        """Create a session manager with test database."""
-        return SessionManager(tmp_db_path)
+    def manager(self, session_manager: SessionManager) -> SessionManager:
+        """Session manager on the shared in-memory test database."""
+        return session_manager
 
     def test_create_session(self, manager: SessionManager):
         """Test creating a new session."""
@@ -76,10 +95,10 @@ class TestSessionManager:
         """Test creating session with codebase path."""
         session = manager.create(
             name="Project Session",
-            codebase_path="/home/user/project",
+            codebase_path=_FIXTURE_PATH_STR,
         )
 
-        assert session.codebase_path == Path("/home/user/project")
+        assert session.codebase_path == _FIXTURE_PATH
 
     def test_create_with_metadata(self, manager: SessionManager):
         """Test creating session with metadata."""
@@ -110,18 +129,12 @@ class TestSessionManager:
         session = manager.create(name="Test")
         original_accessed = session.last_accessed
 
-        # Small delay to ensure timestamp changes
-        import time
-        time.sleep(0.01)
-
         loaded = manager.load(session.id)
         assert loaded.last_accessed > original_accessed
 
     def test_list_all(self, manager: SessionManager):
         """Test listing all sessions."""
-        manager.create(name="Session 1")
-        manager.create(name="Session 2")
-        manager.create(name="Session 3")
+        manager.create_many(["Session 1", "Session 2", "Session 3"])
 
         sessions = manager.list_all()
 
@@ -129,10 +142,28 @@ class TestSessionManager:
         # Should be ordered by last_accessed DESC
         assert sessions[0].name == "Session 3"
 
+    def test_list_all_decodes_metadata(self, manager: SessionManager):
+        """Test listed sessions carry decoded metadata."""
+        manager.create(name="Plain")
+        manager.create(name="Tagged", metadata={"tags": ["a", "b"], "n": 1})
+
+        by_name = {s.name: s for s in manager.list_all()}
+
+        assert by_name["Plain"].metadata == {}
+        assert by_name["Tagged"].metadata == {"tags": ["a", "b"], "n": 1}
+
+    def test_create_many(self, manager: SessionManager):
+        """Test creating several sessions at once."""
+        created = manager.create_many(["A", "B", "C"])
+
+        assert [s.name for s in created] == ["A", "B", "C"]
+        assert len({s.id for s in created}) == 3
+        assert manager.load(created[1].id).name == "B"
+        assert len(manager.list_all()) == 3
+
     def test_get_recent(self, manager: SessionManager):
         """Test getting recent sessions with limit."""
-        for i in range(5):
-            manager.create(name=f"Session {i}")
+        manager.create_many([f"Session {i}" for i in range(5)])
 
         recent = manager.get_recent(limit=3)
 
@@ -176,3 +207,15 @@ class TestSessionManager:
 
         assert loaded is not None
         assert loaded.name == "Persistent"
+
+    def test_init_schema_on_connection(self):
+        """Test schema creation on an already-open connection."""
+        conn = sqlite3.connect(":memory:")
+
+        SessionManager.init_schema(conn)
+
+        tables = {
+            row[0]
+            for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+        }
+        assert {"sessions", "messages", "token_usage"} <= tables
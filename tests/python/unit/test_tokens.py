@@ -2,13 +2,13 @@
 
 import pytest
 from datetime import datetime
-from pathlib import Path
 
 from openagent.telemetry.tokens import (
     TokenUsage,
     TokenTracker,
     SessionTokenStats,
     MODEL_PRICING,
+    batch_timestamp,
 )
 from openagent.memory.session import SessionManager
 
@@ -65,6 +65,32 @@ class TestTokenUsage:
         # Should match gpt-4o-mini pricing
         assert usage.estimated_cost() == pytest.approx(0.75, rel=0.01)
 
+    def test_cost_estimation_longest_match_wins(self):
+        """Test an unlisted version suffix resolves to the most specific model."""
+        usage = TokenUsage(
+            input_tokens=1_000_000,
+            output_tokens=1_000_000,
+            model="gpt-4o-mini-2025-01-01",
+        )
+        # gpt-4o-mini, not the shorter gpt-4 or gpt-4o entries
+        assert usage.estimated_cost() == pytest.approx(0.75, rel=0.01)
+
+    def test_cost_estimation_sees_pricing_updates(self, monkeypatch):
+        """Test runtime changes to MODEL_PRICING are picked up."""
+        usage = TokenUsage(
+            input_tokens=1_000_000,
+            output_tokens=0,
+            model="gpt-5-preview",
+        )
+        assert usage.estimated_cost() == pytest.approx(10.0)  # default pricing
+
+        monkeypatch.setitem(MODEL_PRICING, "gpt-5", {"input": 1.0, "output": 2.0})
+        assert usage.estimated_cost() == pytest.approx(1.0)
+
+        # A longer name added later takes precedence in the partial match
+        monkeypatch.setitem(MODEL_PRICING, "gpt-5-pre", {"input": 3.0, "output": 6.0})
+        assert usage.estimated_cost() == pytest.approx(3.0)
+
     def test_zero_tokens(self):
         """Test with zero tokens."""
         usage = TokenUsage(
@@ -83,6 +109,18 @@ class TestTokenUsage:
 
         assert before <= usage.timestamp <= after
 
+    def test_batch_timestamp(self):
+        """Test usages created in a batch share one timestamp."""
+        with batch_timestamp() as ts:
+            usages = [
+                TokenUsage(input_tokens=n, output_tokens=0, model="gpt-4o")
+                for n in range(3)
+            ]
+
+        assert all(u.timestamp == ts for u in usages)
+        after = TokenUsage(input_tokens=1, output_tokens=0, model="gpt-4o")
+        assert after.timestamp >= ts
+
 
 class TestSessionTokenStats:
     """Tests for SessionTokenStats dataclass."""
@@ -118,12 +156,10 @@ class TestTokenTracker:
     """Tests for TokenTracker class."""
 
     @pytest.fixture
-    def tracker(self, tmp_db_path: Path) -> TokenTracker:
-        """Create a token tracker with test database."""
-        # Initialize the database schema first
-        session_mgr = SessionManager(tmp_db_path)
-        session = session_mgr.create(name="test-session")
-        return TokenTracker(session.id, tmp_db_path)
+    def tracker(self, session_manager: SessionManager) -> TokenTracker:
+        """Create a token tracker on the shared in-memory test database."""
+        session = session_manager.create(name="test-session")
+        return TokenTracker(session.id, session_manager.db_path)
 
     def test_record_and_retrieve(self, tracker: TokenTracker):
         """Test recording and retrieving token usage."""
@@ -142,13 +178,10 @@ class TestTokenTracker:
 
     def test_multiple_records(self, tracker: TokenTracker):
         """Test recording multiple usages."""
-        for i in range(3):
-            usage = TokenUsage(
-                input_tokens=100,
-                output_tokens=200,
-                model="gpt-4o-mini",
-            )
-            tracker.record(usage)
+        tracker.record_many(
+            TokenUsage(input_tokens=100, output_tokens=200, model="gpt-4o-mini")
+            for _ in range(3)
+        )
 
         stats = tracker.get_session_stats()
         assert stats.total_input == 300
@@ -219,15 +252,83 @@ class TestTokenTracker:
 
         assert len(received) == 0
 
+    def test_unsubscribe_bound_method(self, tracker: TokenTracker):
+        """Test a bound method can be unsubscribed via a fresh reference."""
+        received: list[TokenUsage] = []
+
+        tracker.subscribe(received.append)
+        tracker.unsubscribe(received.append)
+        tracker.unsubscribe(received.append)  # unknown callbacks are ignored
+
+        tracker.record(TokenUsage(input_tokens=1, output_tokens=1, model="gpt-4o"))
+
+        assert received == []
+
+    def test_subscribe_twice_delivers_twice(self, tracker: TokenTracker):
+        """Test each subscription is notified, including duplicates and unhashable callables."""
+        received: list[TokenUsage] = []
+
+        class Listener:
+            __hash__ = None  # unhashable callables are accepted
+
+            def __call__(self, usage: TokenUsage) -> None:
+                received.append(usage)
+
+        listener = Listener()
+        tracker.subscribe(listener)
+        tracker.subscribe(listener)
+
+        tracker.record(TokenUsage(input_tokens=1, output_tokens=1, model="gpt-4o"))
+        assert len(received) == 2
+
+        tracker.unsubscribe(listener)  # removes one subscription at a time
+        tracker.record(TokenUsage(input_tokens=1, output_tokens=1, model="gpt-4o"))
+        assert len(received) == 3
+
+    def test_record_many_notifies_each_usage(self, tracker: TokenTracker):
+        """Test bulk recording notifies subscribers once per usage."""
+        received: list[TokenUsage] = []
+        tracker.subscribe(received.append)
+        tracker.get_session_stats()  # load the running totals
+
+        tracker.record_many(
+            TokenUsage(input_tokens=n, output_tokens=0, model="gpt-4o-mini")
+            for n in (1, 2)
+        )
+
+        assert [u.input_tokens for u in received] == [1, 2]
+        assert tracker.get_session_stats().request_count == 2
+
+    def test_record_prices_each_usage_once(self, tracker: TokenTracker, monkeypatch):
+        """Test the row and the running totals share one cost estimate."""
+        priced: list[str] = []
+        estimate = TokenUsage.estimated_cost
+
+        def counting(usage: TokenUsage) -> float:
+            priced.append(usage.model)
+            return estimate(usage)
+
+        monkeypatch.setattr(TokenUsage, "estimated_cost", counting)
+        tracker.get_session_stats()  # load the running totals
+
+        tracker.record(TokenUsage(input_tokens=1, output_tokens=1, model="gpt-4o"))
+        tracker.record_many(
+            TokenUsage(input_tokens=1, output_tokens=1, model="gpt-4o-mini")
+            for _ in range(2)
+        )
+
+        assert priced == ["gpt-4o", "gpt-4o-mini", "gpt-4o-mini"]
+
     def test_get_usage_history(self, tracker: TokenTracker):
         """Test retrieving usage history."""
-        for i in range(5):
-            usage = TokenUsage(
+        tracker.record_many(
+            TokenUsage(
                 input_tokens=100 * (i + 1),
                 output_tokens=200,
                 model="gpt-4o-mini",
             )
-            tracker.record(usage)
+            for i in range(5)
+        )
 
         history = tracker.get_usage_history(limit=3)
         assert len(history) == 3
@@ -249,3 +350,20 @@ class TestTokenTracker:
 
         stats2 = tracker.get_session_stats()
         assert stats2.total_tokens == 600
+
+    def test_stats_loaded_from_existing_rows(self, tracker: TokenTracker):
+        """Test a new tracker picks up usage recorded by an earlier one."""
+        tracker.record(TokenUsage(input_tokens=100, output_tokens=200, model="gpt-4o"))
+
+        other = TokenTracker(tracker.session_id, tracker.db_path)
+        other.record(TokenUsage(input_tokens=1, output_tokens=2, model="gpt-4o"))
+
+        stats = other.get_session_stats()
+        assert stats.total_tokens == 303
+        assert stats.request_count == 2
+
+    def test_stats_returns_copy(self, tracker: TokenTracker):
+        """Test callers cannot mutate the tracker's running totals."""
+        tracker.get_session_stats().total_input = 999
+
+        assert tracker.get_session_stats().total_input == 0
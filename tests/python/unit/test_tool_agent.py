@@ -9,6 +9,32 @@ from openagent.tools.registry import ToolRegistry, Tool
 from openagent.tools.executor import ToolCall, ToolResult
 
 
+def seq_async(values):
+    """Lightweight async stub returning ``values`` in order, recording calls."""
+    it = iter(values)
+    calls = []
+
+    async def _fn(*args, **kwargs):
+        calls.append((args, kwargs))
+        return next(it)
+
+    _fn.calls = calls
+    return _fn
+
+
+@pytest.fixture(scope="class")
+def parse_agent():
+    """Create one agent shared by the parse tests (they don't mutate it)."""
+    return ToolAgent(
+        config=ToolAgentConfig(
+            enable_filesystem=False,
+            enable_shell=False,
+            enable_git=False,
+        ),
+        llm_client=MagicMock(),
+    )
+
+
 class TestToolAgentConfig:
     """Tests for ToolAgentConfig."""
 
@@ -133,72 +159,104 @@ class TestToolPromptGeneration:
         assert "arg2: integer" in prompt
         assert '{"tool": "tool_name"' in prompt
 
-
-class TestToolCallParsing:
-    """Tests for parsing tool calls from responses."""
-
-    def setup_method(self):
-        """Set up test agent."""
-        self.agent = ToolAgent(
+    def test_prompt_cached_until_registry_changes(self):
+        """Test prompt is reused until a tool is registered or removed."""
+        registry = ToolRegistry()
+        registry.register(Tool(name="first", description="First tool"))
+        agent = ToolAgent(
             config=ToolAgentConfig(
                 enable_filesystem=False,
                 enable_shell=False,
                 enable_git=False,
             ),
+            registry=registry,
             llm_client=MagicMock(),
         )
 
-    def test_parse_valid_tool_call(self):
+        prompt = agent._get_tool_prompt()
+        assert agent._get_tool_prompt() is prompt
+
+        registry.register(Tool(name="second", description="Second tool"))
+        assert "second" in agent._get_tool_prompt()
+
+        registry.unregister("second")
+        assert "second" not in agent._get_tool_prompt()
+
+
+class TestToolCallParsing:
+    """Tests for parsing tool calls from responses."""
+
+    def test_parse_valid_tool_call(self, parse_agent):
         """Test parsing a valid tool call."""
         response = '{"tool": "read_file", "args": {"path": "/test.txt"}}'
-        call = self.agent._parse_tool_call(response)
+        call = parse_agent._parse_tool_call(response)
 
         assert call is not None
         assert call.name == "read_file"
         assert call.params == {"path": "/test.txt"}
 
-    def test_parse_tool_call_with_reasoning(self):
+    def test_parse_tool_call_with_reasoning(self, parse_agent):
         """Test parsing tool call with reasoning."""
         response = '{"tool": "search", "args": {"query": "test"}, "reasoning": "Need to find test files"}'
-        call = self.agent._parse_tool_call(response)
+        call = parse_agent._parse_tool_call(response)
 
         assert call is not None
         assert call.name == "search"
         assert call.reasoning == "Need to find test files"
 
-    def test_parse_tool_call_embedded_in_text(self):
+    def test_parse_tool_call_embedded_in_text(self, parse_agent):
         """Test parsing tool call embedded in natural language."""
         response = 'Let me check that file for you. {"tool": "read_file", "args": {"path": "/test.txt"}} I will analyze it.'
-        call = self.agent._parse_tool_call(response)
+        call = parse_agent._parse_tool_call(response)
 
         assert call is not None
         assert call.name == "read_file"
 
-    def test_parse_no_tool_call(self):
+    def test_parse_no_tool_call(self, parse_agent):
         """Test parsing response with no tool call."""
         response = "Here is my answer to your question."
-        call = self.agent._parse_tool_call(response)
+        call = parse_agent._parse_tool_call(response)
 
         assert call is None
 
-    def test_parse_invalid_json(self):
+    def test_parse_invalid_json(self, parse_agent):
         """Test parsing invalid JSON."""
         response = '{"tool": "broken'
-        call = self.agent._parse_tool_call(response)
+        call = parse_agent._parse_tool_call(response)
 
         assert call is None
 
-    def test_parse_json_without_tool_key(self):
+    def test_parse_json_without_tool_key(self, parse_agent):
         """Test parsing JSON without tool key."""
         response = '{"name": "something", "value": 123}'
-        call = self.agent._parse_tool_call(response)
+        call = parse_agent._parse_tool_call(response)
 
         assert call is None
 
-    def test_parse_empty_args(self):
+    def test_parse_tool_call_after_other_json(self, parse_agent):
+        """Test parsing a tool call that follows unrelated JSON and braces."""
+        response = (
+            'Config is {"debug": true}. '
+            '{"tool": "read_file", "args": {"path": "/a.txt"}} then {done}'
+        )
+        call = parse_agent._parse_tool_call(response)
+
+        assert call is not None
+        assert call.name == "read_file"
+        assert call.params == {"path": "/a.txt"}
+
+    def test_parse_tool_key_after_args(self, parse_agent):
+        """Test parsing a tool call whose "tool" key follows nested args."""
+        response = '{"args": {"path": "/a.txt"}, "tool": "read_file"}'
+        call = parse_agent._parse_tool_call(response)
+
+        assert call is not None
+        assert call.name == "read_file"
+
+    def test_parse_empty_args(self, parse_agent):
         """Test parsing tool call with no args."""
         response = '{"tool": "list_files"}'
-        call = self.agent._parse_tool_call(response)
+        call = parse_agent._parse_tool_call(response)
 
         assert call is not None
         assert call.name == "list_files"
@@ -267,21 +325,21 @@ class TestChatWithTools:
         assert "could not" in result.lower() or "exist" in result.lower()
 
     @pytest.mark.asyncio
-    async def test_max_iterations(self, mock_agent):
+    async def test_max_iterations(self, mock_agent, monkeypatch):
         """Test max iterations limit."""
-        mock_agent.tool_config.max_tool_iterations = 2
+        monkeypatch.setattr(mock_agent.tool_config, "max_tool_iterations", 2)
 
         # Always return tool call to hit limit
-        mock_agent.chat = AsyncMock(return_value='{"tool": "test", "args": {}}')
-        mock_agent.executor.execute = AsyncMock(return_value=ToolResult(
-            output="result",
-            success=True,
-        ))
+        mock_agent.chat = seq_async(['{"tool": "test", "args": {}}'] * 20)
+        mock_agent.executor.execute = seq_async(
+            [ToolResult(output="result", success=True)] * 20
+        )
 
         result = await mock_agent.chat_with_tools("Keep using tools")
 
         assert "maximum" in result.lower()
-        assert mock_agent.executor.execute.call_count == 2
+        assert len(mock_agent.chat.calls) == 2
+        assert len(mock_agent.executor.execute.calls) == 2
 
     @pytest.mark.asyncio
     async def test_system_prompt_restored(self, mock_agent):
@@ -1,6 +1,9 @@
 """Tests for tool registry and executor."""
 
+import asyncio
+import dataclasses
 import pytest
+import sys
 
 from openagent.tools.registry import Tool, ToolRegistry
 from openagent.tools.executor import ToolExecutor, ToolCall, ToolResult
@@ -58,6 +61,13 @@ class TestToolRegistry:
         assert tool.handler is my_handler
         assert registry.get("search") is not None
 
+    def test_register_interns_name(self, registry: ToolRegistry):
+        """Test registered tool names are interned."""
+        name = "".join(["dynamic", "_tool"])  # built at runtime, not interned
+        registry.register(Tool(name=name, description="Dynamic"))
+
+        assert registry.get(name).name is sys.intern(name)
+
     def test_get_nonexistent(self, registry: ToolRegistry):
         """Test getting nonexistent tool."""
         assert registry.get("nonexistent") is None
@@ -123,6 +133,51 @@ class TestToolRegistry:
         assert llm_format[0]["function"]["name"] == "search"
         assert llm_format[0]["function"]["description"] == "Search the codebase"
 
+    def test_to_llm_format_tracks_changes(self, registry: ToolRegistry):
+        """Test the cached LLM format is rebuilt after the registry changes."""
+        registry.register(Tool(name="tool1", description="Tool 1"))
+        first = registry.to_llm_format()
+        first[0]["function"]["name"] = "edited"
+        first[0]["function"]["parameters"]["extra"] = True
+        first.clear()  # callers get their own list and entries
+
+        assert registry.to_llm_format()[0]["function"] == {
+            "name": "tool1",
+            "description": "Tool 1",
+            "parameters": {},
+        }
+        assert registry.get("tool1").input_schema == {}
+
+        registry.register(Tool(name="tool2", description="Tool 2"))
+        registry.unregister("tool1")
+
+        assert [t["function"]["name"] for t in registry.to_llm_format()] == ["tool2"]
+
+    def test_register_rejects_invalid_schema(self, registry: ToolRegistry):
+        """Test a schema that fails to compile is reported, not silently skipped."""
+        pytest.importorskip("fastjsonschema")
+
+        with pytest.raises(ValueError, match="Tool broken"):
+            registry.register(
+                Tool(name="broken", description="Broken", input_schema={"type": "nope"})
+            )
+
+        assert registry.get("broken") is None
+        assert registry.get_validator("broken") is None
+
+    def test_get_validator_and_version(self, registry: ToolRegistry):
+        """Test validator lookup and the change counter."""
+        start = registry.version
+        registry.register(Tool(name="search", description="Search", input_schema={"required": ["query"]}))
+
+        required, _ = registry.get_validator("search")
+        assert required == ("query",)
+        assert registry.get_validator("missing") is None
+        assert registry.version > start
+
+        registry.unregister("search")
+        assert registry.get_validator("search") is None
+
 
 class TestToolResult:
     """Tests for ToolResult dataclass."""
@@ -148,6 +203,9 @@ class TestToolResult:
         d = result.to_dict()
 
         assert d == {"success": True, "output": "data", "error": None}
+        d["output"] = "changed"
+        assert result.to_dict() == {"success": True, "output": "data", "error": None}
+        assert result == ToolResult(success=True, output="data")
 
     def test_to_json(self):
         """Test JSON conversion."""
@@ -158,44 +216,71 @@ class TestToolResult:
         assert '"output": "data"' in j
 
 
-class TestToolExecutor:
-    """Tests for ToolExecutor class."""
+@pytest.mark.parametrize(
+    "obj",
+    [
+        Tool(name="t", description="Tool"),
+        ToolCall(name="t"),
+        ToolResult(success=True),
+    ],
+    ids=lambda o: type(o).__name__,
+)
+def test_tool_types_use_slots(obj):
+    """Test tool dataclasses are slotted (no per-instance __dict__)."""
+    assert not hasattr(obj, "__dict__")
 
-    @pytest.fixture
-    def executor(self) -> ToolExecutor:
-        """Create an executor with test tools."""
-        registry = ToolRegistry()
 
-        async def echo_handler(message: str) -> str:
-            return f"Echo: {message}"
+def test_tool_result_is_immutable():
+    """Test ToolResult instances can't be modified once created."""
+    result = ToolResult(success=True, output="data")
 
-        async def error_handler() -> None:
-            raise ValueError("Test error")
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        result.output = "other"
 
-        registry.register_function(
-            name="echo",
-            description="Echo a message",
-            handler=echo_handler,
-            input_schema={
-                "type": "object",
-                "properties": {"message": {"type": "string"}},
-                "required": ["message"],
-            },
-        )
 
-        registry.register_function(
-            name="error",
-            description="Always errors",
-            handler=error_handler,
-        )
+def _make_executor() -> ToolExecutor:
+    """Create an executor with test tools."""
+    registry = ToolRegistry()
 
-        registry.register(
-            Tool(name="no_handler", description="No handler", handler=None)
-        )
+    async def echo_handler(message: str) -> str:
+        return f"Echo: {message}"
+
+    async def error_handler() -> None:
+        raise ValueError("Test error")
+
+    registry.register_function(
+        name="echo",
+        description="Echo a message",
+        handler=echo_handler,
+        input_schema={
+            "type": "object",
+            "properties": {"message": {"type": "string"}},
+            "required": ["message"],
+        },
+    )
+
+    registry.register_function(
+        name="error",
+        description="Always errors",
+        handler=error_handler,
+    )
+
+    registry.register(
+        Tool(name="no_handler", description="No handler", handler=None)
+    )
+
+    return ToolExecutor(registry)
 
-        return ToolExecutor(registry)
 
-    @pytest.mark.asyncio
+class TestToolExecutor:
+    """Tests for ToolExecutor class."""
+
+    @pytest.fixture
+    def executor(self) -> ToolExecutor:
+        """Create an executor with test tools (and an empty result cache)."""
+        return _make_executor()
+
+    @pytest.mark.asyncio(loop_scope="module")
     async def test_execute_success(self, executor: ToolExecutor):
         """Test successful tool execution."""
         call = ToolCall(name="echo", params={"message": "Hello"})
@@ -204,7 +289,7 @@ class TestToolExecutor:
         assert result.success is True
         assert result.output == "Echo: Hello"
 
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="module")
     async def test_execute_unknown_tool(self, executor: ToolExecutor):
         """Test executing unknown tool."""
         call = ToolCall(name="unknown", params={})
@@ -213,7 +298,7 @@ class TestToolExecutor:
         assert result.success is False
         assert "Unknown tool" in result.error
 
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="module")
     async def test_execute_no_handler(self, executor: ToolExecutor):
         """Test executing tool with no handler."""
         call = ToolCall(name="no_handler", params={})
@@ -222,7 +307,7 @@ class TestToolExecutor:
         assert result.success is False
         assert "no handler" in result.error
 
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="module")
     async def test_execute_handler_error(self, executor: ToolExecutor):
         """Test handling errors from tool handler."""
         call = ToolCall(name="error", params={})
@@ -231,7 +316,19 @@ class TestToolExecutor:
         assert result.success is False
         assert "Test error" in result.error
 
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="module")
+    async def test_execute_sync_handler(self, executor: ToolExecutor):
+        """Test plain (non-async) handlers are called directly."""
+        def add(a: int, b: int) -> int:
+            return a + b
+
+        executor.registry.register_function(name="add", description="Add", handler=add)
+
+        result = await executor.execute(ToolCall(name="add", params={"a": 2, "b": 3}))
+
+        assert result == ToolResult(success=True, output=5)
+
+    @pytest.mark.asyncio(loop_scope="module")
     async def test_execute_batch(self, executor: ToolExecutor):
         """Test batch execution."""
         calls = [
@@ -244,6 +341,139 @@ class TestToolExecutor:
         assert results[0].output == "Echo: First"
         assert results[1].output == "Echo: Second"
 
+    @pytest.mark.asyncio(loop_scope="module")
+    async def test_execute_batch_mixed_calls(self, executor: ToolExecutor):
+        """Test batch results line up with calls when some tools can't run."""
+        calls = [
+            ToolCall(name="unknown", params={}),
+            ToolCall(name="echo", params={"message": "Hi"}),
+            ToolCall(name="no_handler", params={}),
+            ToolCall(name="unknown", params={}),
+        ]
+        results = await executor.execute_batch(calls)
+
+        assert [r.success for r in results] == [False, True, False, False]
+        assert results[1].output == "Echo: Hi"
+        assert "no handler" in results[2].error
+        assert results[3].error == "Unknown tool: unknown"
+
+    @pytest.mark.asyncio(loop_scope="module")
+    async def test_execute_batch_runs_concurrently(self):
+        """Test batch calls run sequentially by default and overlap up to max_concurrency."""
+        active = peak = 0
+
+        async def slow(n: int) -> int:
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0)
+            active -= 1
+            return n
+
+        registry = ToolRegistry()
+        registry.register_function(name="slow", description="Slow", handler=slow)
+        executor = ToolExecutor(registry)
+        calls = [ToolCall(name="slow", params={"n": n}) for n in range(4)]
+
+        results = await executor.execute_batch(calls)
+        assert [r.output for r in results] == [0, 1, 2, 3]
+        assert peak == 1  # sequential unless the caller opts in
+
+        peak = 0
+        results = await executor.execute_batch(calls, max_concurrency=4)
+        assert [r.output for r in results] == [0, 1, 2, 3]
+        assert peak == 4
+
+        peak = 0
+        await executor.execute_batch(calls, max_concurrency=2)
+        assert peak == 2
+
+    @pytest.mark.asyncio(loop_scope="module")
+    async def test_execute_cacheable_reuses_result(self):
+        """Test cacheable tools run once per distinct set of params."""
+        calls = []
+
+        async def lookup(key: str, verbose: bool = False) -> str:
+            calls.append(key)
+            return key.upper()
+
+        registry = ToolRegistry()
+        registry.register_function(
+            name="lookup", description="Lookup", handler=lookup, cacheable=True
+        )
+        executor = ToolExecutor(registry, cache_size=1)
+
+        first = await executor.execute(ToolCall(name="lookup", params={"key": "a", "verbose": True}))
+        again = await executor.execute(ToolCall(name="lookup", params={"verbose": True, "key": "a"}))
+        assert first == again == ToolResult(success=True, output="A")
+        assert first is not again
+        assert calls == ["a"]
+
+        await executor.execute(ToolCall(name="lookup", params={"key": "b"}))
+        await executor.execute(ToolCall(name="lookup", params={"key": "a", "verbose": True}))
+        assert calls == ["a", "b", "a"]  # "a" was evicted by the size-1 cache
+
+    @pytest.mark.asyncio(loop_scope="module")
+    async def test_execute_cache_returns_independent_outputs(self):
+        """Test mutating a returned output doesn't change later cached results."""
+        async def config() -> dict:
+            return {"items": [1, 2]}
+
+        registry = ToolRegistry()
+        registry.register_function(
+            name="config", description="Config", handler=config, cacheable=True
+        )
+        executor = ToolExecutor(registry)
+
+        first = await executor.execute(ToolCall(name="config"))
+        first.output["items"].append(3)
+        second = await executor.execute(ToolCall(name="config"))
+        second.output["items"].clear()
+        third = await executor.execute(ToolCall(name="config"))
+
+        assert third.output == {"items": [1, 2]}
+
+    @pytest.mark.asyncio(loop_scope="module")
+    async def test_execute_cache_cleared_on_reregister(self):
+        """Test cached results are dropped when a tool is replaced or removed."""
+        async def old() -> str:
+            return "old"
+
+        async def new() -> str:
+            return "new"
+
+        registry = ToolRegistry()
+        registry.register_function(name="t", description="T", handler=old, cacheable=True)
+        executor = ToolExecutor(registry)
+        assert (await executor.execute(ToolCall(name="t"))).output == "old"
+
+        registry.register_function(name="t", description="T", handler=new, cacheable=True)
+        assert (await executor.execute(ToolCall(name="t"))).output == "new"
+
+        registry.unregister("t")
+        assert (await executor.execute(ToolCall(name="t"))).success is False
+
+    @pytest.mark.asyncio(loop_scope="module")
+    async def test_execute_does_not_cache_failures(self):
+        """Test failed results from cacheable tools are retried."""
+        attempts = []
+
+        async def flaky() -> str:
+            attempts.append(1)
+            if len(attempts) == 1:
+                raise RuntimeError("try again")
+            return "ok"
+
+        registry = ToolRegistry()
+        registry.register_function(
+            name="flaky", description="Flaky", handler=flaky, cacheable=True
+        )
+        executor = ToolExecutor(registry)
+
+        assert (await executor.execute(ToolCall(name="flaky"))).success is False
+        assert (await executor.execute(ToolCall(name="flaky"))).output == "ok"
+        assert len(attempts) == 2
+
     def test_validate_call_valid(self, executor: ToolExecutor):
         """Test validating a valid call."""
         call = ToolCall(name="echo", params={"message": "Hello"})
@@ -267,3 +497,52 @@ class TestToolExecutor:
 
         assert is_valid is False
         assert "Missing required parameter" in error
+
+    def test_validate_call_checks_schema_types(self, executor: ToolExecutor):
+        """Test the compiled schema rejects params of the wrong type."""
+        pytest.importorskip("fastjsonschema")
+        call = ToolCall(name="echo", params={"message": 42})
+        is_valid, error = executor.validate_call(call)
+
+        assert is_valid is False
+        assert error == "Invalid parameters: data.message must be string"
+
+    @pytest.mark.asyncio(loop_scope="module")
+    async def test_validate_call_leaves_params_unchanged(self):
+        """Test validation never fills schema defaults into the call's params."""
+        def add(x: int, y: int = 1) -> int:
+            return x + y
+
+        registry = ToolRegistry()
+        registry.register_function(
+            name="add",
+            description="Add",
+            handler=add,
+            input_schema={
+                "type": "object",
+                "properties": {
+                    "x": {"type": "integer"},
+                    "y": {"type": "integer", "default": 5},
+                },
+            },
+        )
+        executor = ToolExecutor(registry)
+        call = ToolCall(name="add", params={"x": 1})
+
+        assert executor.validate_call(call) == (True, "")
+        assert call.params == {"x": 1}
+        assert (await executor.execute(call)).output == 2
+
+    def test_validate_call_after_reregister(self, executor: ToolExecutor):
+        """Test validation follows the schema of the latest registration."""
+        executor.registry.register(
+            Tool(name="echo", description="Echo", input_schema={"required": ["text"]})
+        )
+
+        assert executor.validate_call(ToolCall(name="echo", params={"text": "hi"})) == (True, "")
+        is_valid, error = executor.validate_call(ToolCall(name="echo", params={"message": "hi"}))
+        assert is_valid is False
+        assert error == "Missing required parameter: text"
+
+        executor.registry.unregister("echo")
+        assert executor.validate_call(ToolCall(name="echo", params={"text": "hi"}))[0] is False